@@ -0,0 +1,19 @@
+import pytest
+
+from watersustain.api import etag_matches
+
+ETAG = '"0123456789abcdef0123"'
+
+
+@pytest.mark.parametrize('header, expected', [
+    (ETAG, True),
+    (f'W/{ETAG}', True),
+    (f'"other", {ETAG}', True),
+    (f'"other",W/{ETAG}', True),
+    ('*', True),
+    ('"other"', False),
+    ('', False),
+    (None, False),
+])
+def test_if_none_match_forms(header, expected):
+    assert etag_matches(header, ETAG) is expected
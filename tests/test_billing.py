@@ -0,0 +1,57 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from watersustain import billing
+from watersustain.sites import MALETE, SitePartition
+
+
+@pytest.mark.parametrize('consumption, expected', [
+    (0.0, 0.0),
+    (0.5, 25.0),        # inside the lifeline block
+    (1.0, 50.0),        # lifeline block full
+    (1.5, 125.0),       # first block starts above the lifeline
+    (5.0, 650.0),       # first block full
+    (5.5, 775.0),
+    (15.0, 3150.0),     # second block full
+    (16.0, 3550.0),     # open-ended top block
+])
+def test_block_pricing_at_tier_boundaries(consumption, expected):
+    charges = billing.price_consumption([consumption], 0.0)
+    assert charges['volumetric_charge'][0] == pytest.approx(expected)
+    assert charges['total_due'][0] == pytest.approx(expected + billing.DEFAULT_TARIFF['service_charge'])
+    assert charges['lifeline_m3'][0] == pytest.approx(min(consumption, 1.0))
+
+
+def test_surcharges_follow_the_site_tariff_and_missing_regions_pay_none():
+    accounts = pd.DataFrame({
+        'account_id': ['a', 'b', 'c', 'd'],
+        'region': ['East Quarter', np.nan, 'Central Malete', 'Unlisted'],
+        'consumption_m3': [3.0, 3.0, 3.0, 3.0],
+    })
+    invoices = pd.concat(billing.bill_chunks(accounts, '2026-09', billing.site_tariff(MALETE), chunk_size=3))
+    assert invoices['surcharge'].tolist() == pytest.approx([35.0, 0.0, 0.0, 0.0])
+
+    totals = billing.RunTotals()
+    for chunk in billing.bill_chunks(accounts, '2026-09', billing.site_tariff(MALETE), chunk_size=3):
+        totals.add(chunk)
+    overall = totals.overall()
+    assert overall['accounts'] == 4
+    assert overall['total_due'] == pytest.approx(invoices['total_due'].sum())
+
+
+def test_account_ids_are_unique_across_regions_with_a_shared_prefix():
+    regions = [{'name': 'South District', 'users': 3}, {'name': 'South Quarter', 'users': 3}]
+    accounts = billing.accounts_from_regions(regions, {'South District': 9000.0, 'South Quarter': 6000.0})
+    assert accounts['account_id'].is_unique
+    assert accounts.groupby('region')['consumption_m3'].sum().to_dict() == pytest.approx(
+        {'South District': 9.0, 'South Quarter': 6.0})
+
+
+def test_site_bill_run_is_labelled_with_the_billed_window():
+    partition = SitePartition(MALETE, data_dir=None)
+    end = partition.usage_history[-1]['timestamp']
+    start = end - datetime.timedelta(days=30) + datetime.timedelta(microseconds=1)
+    assert partition.billing_summary()['period'] == f"{start:%Y-%m-%d} to {end:%Y-%m-%d}"
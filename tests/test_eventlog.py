@@ -0,0 +1,86 @@
+import datetime
+import os
+import time
+
+from watersustain import eventlog
+from watersustain.eventlog import EventLog
+from watersustain.sites import MALETE, SitePartition
+
+
+def test_recover_cuts_a_torn_last_line(tmp_path):
+    log = EventLog(str(tmp_path), fsync=False)
+    log.snapshot({'value': 0})
+    for value in (1, 2, 3):
+        log.append('set', {'value': value})
+    log.close()
+
+    segment = tmp_path / 'log-000000000001.jsonl'
+    with open(segment, 'a', encoding='utf-8') as f:
+        f.write('{"seq": 4, "time": "2026-')  # crash mid-write
+
+    log = EventLog(str(tmp_path), fsync=False)
+    state, tail = log.recover()
+    assert state == {'value': 0}
+    assert [event['seq'] for event in tail] == [1, 2, 3]
+
+    # New events continue the sequence on a clean line
+    log.append('set', {'value': 4})
+    log.close()
+    assert [event['data']['value'] for event in EventLog(str(tmp_path)).events()] == [1, 2, 3, 4]
+
+
+def test_state_at_falls_back_past_deleted_snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(eventlog, 'KEEP_SNAPSHOTS', 1)
+    log = EventLog(str(tmp_path), fsync=False)
+    log.snapshot({'value': 0})
+
+    log.append('set', {'value': 1})
+    log.snapshot({'value': 1})
+    time.sleep(0.01)
+    between = datetime.datetime.now()
+    time.sleep(0.01)
+    for value in (2, 3):
+        log.append('set', {'value': value})
+        log.snapshot({'value': value})
+
+    # Only the base snapshot and the newest one are kept
+    assert sorted(os.listdir(tmp_path)) == [
+        'log-000000000001.jsonl', 'log-000000000002.jsonl', 'log-000000000003.jsonl',
+        'snapshot-000000000000.pkl', 'snapshot-000000000003.pkl',
+    ]
+
+    state, events = log.state_at(between)
+    assert state == {'value': 0}
+    assert [event['data']['value'] for event in events] == [1]
+
+
+def test_partition_restores_edits_and_rebuilds_earlier_state(tmp_path):
+    partition = SitePartition(MALETE, str(tmp_path))
+    before = datetime.datetime.now()
+    original = dict(partition.water_data['regions'][0])
+    time.sleep(0.01)
+    partition.update_region(0, {**original, 'users': original['users'] + 10})
+    partition.log.close()
+
+    reopened = SitePartition(MALETE, str(tmp_path))
+    assert reopened.water_data['regions'][0]['users'] == original['users'] + 10
+    assert reopened.user_metrics['total_users'] == partition.user_metrics['total_users']
+    assert reopened.region_at(original['name'], before) == original
+
+
+def test_state_at_picks_the_right_segment(tmp_path):
+    log = EventLog(str(tmp_path), snapshot_every=2, fsync=False)
+    log.snapshot({'value': 0})
+    times = []
+    for value in range(1, 8):
+        log.append('set', {'value': value})
+        time.sleep(0.002)
+        times.append(datetime.datetime.now())
+        if log.should_snapshot():
+            log.snapshot({'value': value})
+
+    for value, when in enumerate(times, 1):
+        state, events = log.state_at(when)
+        replayed = events[-1]['data']['value'] if events else state['value']
+        assert replayed == value
+    assert log.state_at(times[-1] + datetime.timedelta(days=1))[0] == {'value': 6}
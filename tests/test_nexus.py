@@ -0,0 +1,49 @@
+import datetime
+
+import pytest
+
+from watersustain.nexus import GENERATOR_COST, build_nexus_table, region_summary
+from watersustain.scoring import GRID_TARIFF
+
+START = datetime.datetime(2026, 1, 1)
+
+
+def at(minutes):
+    return START + datetime.timedelta(minutes=minutes)
+
+
+def power(minutes, grid_kwh=0.0, generator_kwh=0.0):
+    return {'timestamp': at(minutes), 'solar_kwh': 0.0, 'grid_kwh': grid_kwh, 'generator_kwh': generator_kwh}
+
+
+def usage(minutes, region, usage_l):
+    return {'timestamp': at(minutes), 'region': region, 'usage_l': usage_l, 'capacity_l': 0.0}
+
+
+def test_interval_energy_is_split_by_volume():
+    power_history = [power(0, grid_kwh=10.0), power(60, generator_kwh=20.0)]
+    usage_history = [
+        usage(-30, 'A', 500.0),  # before any power reading: not attributed
+        usage(10, 'A', 300.0),
+        usage(40, 'B', 100.0),
+        usage(90, 'A', 100.0),
+    ]
+    table = build_nexus_table(power_history, usage_history)
+    rows = {(row.region, row.timestamp.hour): row for row in table.itertuples()}
+
+    assert rows[('A', 0)].energy_kwh == pytest.approx(7.5)
+    assert rows[('B', 0)].energy_kwh == pytest.approx(2.5)
+    assert rows[('A', 1)].energy_kwh == pytest.approx(20.0)
+    assert rows[('A', 1)].kwh_per_m3 == pytest.approx(200.0)
+    assert rows[('B', 0)].energy_cost == pytest.approx(2.5 * GRID_TARIFF)
+    assert rows[('A', 1)].energy_cost == pytest.approx(20.0 * GENERATOR_COST)
+
+    summary = region_summary(table).set_index('region')
+    assert summary.loc['A', 'volume_m3'] == pytest.approx(0.4)
+    assert summary.loc['A', 'energy_kwh'] == pytest.approx(27.5)
+
+
+def test_empty_history_gives_an_empty_table():
+    table = build_nexus_table([], [])
+    assert table.empty
+    assert region_summary(table).empty
@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+
+from watersustain.history import power_reading
+from watersustain.scoring import RollingTotals, SustainabilityEngine
+from watersustain.sites import MALETE, SitePartition
+
+START = datetime.datetime(2026, 1, 1)
+
+
+def usage(hour, usage_l, capacity_l=100.0):
+    return {'timestamp': START + datetime.timedelta(hours=hour), 'region': 'A',
+            'usage_l': usage_l, 'capacity_l': capacity_l}
+
+
+def test_rolling_totals_subtract_readings_leaving_the_window():
+    totals = RollingTotals(datetime.timedelta(hours=2), ('usage_l',))
+    for hour, value in enumerate([1.0, 2.0, 4.0]):
+        totals.add(usage(hour, value))
+    totals.advance(START + datetime.timedelta(hours=2))
+    assert totals.totals['usage_l'] == pytest.approx(6.0)  # the reading at hour 0 left
+
+    totals.advance(START + datetime.timedelta(hours=10))
+    assert totals.totals['usage_l'] == pytest.approx(0.0)
+
+
+def test_engine_window_and_monthly_buckets():
+    engine = SustainabilityEngine(window=datetime.timedelta(days=1))
+    engine.record_power(power_reading(START, 10.0, 10.0, 0.0))
+    engine.record_power(power_reading(START + datetime.timedelta(days=2), 30.0, 10.0, 0.0))
+
+    assert engine.snapshot()['energy_kwh'] == pytest.approx(40.0)
+    assert engine.snapshot()['renewable_pct'] == pytest.approx(75.0)
+    assert engine.monthly_series(1)[0]['energy_kwh'] == pytest.approx(60.0)
+
+
+def test_overloaded_network_scores_lower():
+    def score(usage_l):
+        engine = SustainabilityEngine()
+        engine.record_power(power_reading(START, 10.0, 10.0, 0.0))
+        engine.record_usage(usage(0, usage_l))
+        return engine.score()
+
+    assert score(80.0) == pytest.approx(score(85.0))
+    assert score(95.0) < score(85.0)
+
+
+def test_power_changes_meter_only_the_elapsed_interval():
+    partition = SitePartition(MALETE, data_dir=None)
+    last = partition.power_history[-1]
+    end = last['timestamp'] + datetime.timedelta(hours=last.get('hours', 1.0))
+    readings = len(partition.power_history)
+
+    # Inside the interval the last reading already covers: nothing new is metered
+    partition.set_power(10, 10, 10, end - datetime.timedelta(minutes=1))
+    assert len(partition.power_history) == readings
+
+    # Thirty minutes later: the loads in effect are metered for half an hour
+    partition.set_power(20, 20, 20, end + datetime.timedelta(minutes=30))
+    reading = partition.power_history[-1]
+    assert reading['timestamp'] == end
+    assert reading['hours'] == pytest.approx(0.5)
+    assert reading['solar_kwh'] == pytest.approx(10 * 0.5)
+    assert reading['grid_kwh'] == pytest.approx(10 * 0.5)
+
+    # A second change a minute later adds one minute at the previous loads
+    partition.set_power(5, 5, 5, end + datetime.timedelta(minutes=31))
+    assert partition.power_history[-1]['solar_kwh'] == pytest.approx(20 / 60)
@@ -0,0 +1 @@
+"""Support modules for the Sustainable Water Framework dashboard"""
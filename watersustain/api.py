@@ -0,0 +1,283 @@
+"""Read-only JSON metrics API for SCADA screens, SMS alerting and other pollers.
+
+    python -m watersustain.api --port 8502
+
+or set ``WATER_API_PORT`` to serve it from the dashboard process, sharing the
+dashboard's site partitions. Standalone mode reads every site through its
+site worker, so each configured site needs an ``address``; a separate
+process loading the same event logs would never see the dashboard's edits. All endpoints are GET and take an optional
+``?site=<id>`` (default: the first configured site):
+
+    /api/sites      configured sites
+    /api/totals     water, user and sustainability totals
+    /api/regions    per-region usage, capacity and utilization
+    /api/alerts     active alerts
+    /api/power      current power mix
+    /api/forecast   24-hour power forecast
+    /api/network    network-wide overview across all sites
+
+Responses are built at most once per ``CACHE_TTL`` seconds per endpoint and
+site, and carry an ETag; a matching If-None-Match gets an empty 304.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from watersustain.forecast import hourly_power_forecast
+from watersustain.metrics import (
+    build_alerts, get_status_text, renewable_percentage, system_efficiency, total_power, utilization
+)
+from watersustain.sites import SiteRouter, load_sites
+
+API_HOST = os.environ.get('WATER_API_HOST', '0.0.0.0')
+API_PORT = int(os.environ.get('WATER_API_PORT', '8502'))
+CACHE_TTL = 5
+IDLE_TIMEOUT = 30
+MAX_HEADER_LINES = 100
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 503: 'Service Unavailable'}
+
+
+class NotFound(Exception):
+    pass
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header lists ``etag`` (weak comparison) or is ``*``"""
+    for tag in (if_none_match or '').split(','):
+        tag = tag.strip()
+        if tag == '*' or tag.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+def site_totals(partition):
+    data = partition.state()
+    water_data, user_metrics = data['water_data'], data['user_metrics']
+    return {
+        'site': data['site']['id'],
+        'total_usage_l': water_data['total_usage'],
+        'daily_limit_l': water_data['daily_limit'],
+        'efficiency_pct': water_data['efficiency'],
+        'system_efficiency_pct': system_efficiency(water_data['regions']),
+        'total_users': user_metrics['total_users'],
+        'active_users': user_metrics['active_users'],
+        'sustainability_score': partition.score(),
+        'last_30_days': partition.sustainability(),
+    }
+
+
+def site_regions(partition):
+    data = partition.state()
+    return {
+        'site': data['site']['id'],
+        'regions': [{
+            'name': region['name'],
+            'usage_l': region['usage'],
+            'capacity_l': region['capacity'],
+            'users': region['users'],
+            'utilization_pct': utilization(region['usage'], region['capacity']),
+            'status': get_status_text(region['usage'], region['capacity']),
+        } for region in data['water_data']['regions']],
+    }
+
+
+def site_alerts(partition):
+    data = partition.state()
+    return {'site': data['site']['id'], 'alerts': build_alerts(data['water_data'], data['electrical_data'])}
+
+
+def site_power(partition):
+    data = partition.state()
+    electrical_data = data['electrical_data']
+    return {
+        'site': data['site']['id'],
+        'total_kw': total_power(electrical_data),
+        'renewable_pct': renewable_percentage(electrical_data),
+        'sources': {source: {**values, 'utilization_pct': utilization(values['current'], values['capacity'])}
+                    for source, values in electrical_data.items()},
+    }
+
+
+def site_forecast(partition):
+    data = partition.state()
+    forecast = hourly_power_forecast(data['site'], data['electrical_data']['solar']['capacity'])
+    return {
+        'site': data['site']['id'],
+        'hours': [{
+            'hour': int(hour),
+            'solar_kw': float(solar),
+            'demand_kw': float(demand),
+            'grid_kw': float(grid),
+        } for hour, solar, demand, grid in zip(forecast['Hour'], forecast['Solar Available'],
+                                               forecast['Predicted Demand'], forecast['Grid Required'])],
+    }
+
+
+SITE_ENDPOINTS = {
+    '/api/totals': site_totals,
+    '/api/regions': site_regions,
+    '/api/alerts': site_alerts,
+    '/api/power': site_power,
+    '/api/forecast': site_forecast,
+}
+
+
+class MetricsAPI:
+    """Serve cached JSON metrics for the partitions behind a router"""
+
+    def __init__(self, router, ttl=CACHE_TTL):
+        self.router = router
+        self.ttl = ttl
+        self._cache = {}
+        self._pending = {}
+
+    def build(self, path, site_id):
+        """Compute the payload for an endpoint"""
+        if path == '/api/sites':
+            return {'sites': [{'id': key, 'name': name} for key, name in self.router.sites().items()]}
+        if path == '/api/network':
+            return self.router.network_overview()
+        if path not in SITE_ENDPOINTS:
+            raise NotFound(f"unknown endpoint {path}")
+        site_id = site_id or next(iter(self.router.sites()))
+        try:
+            partition = self.router[site_id]
+        except KeyError:
+            raise NotFound(f"unknown site {site_id}")
+        return SITE_ENDPOINTS[path](partition)
+
+    def render(self, path, site_id):
+        """Return (etag, body) for an endpoint"""
+        body = json.dumps(self.build(path, site_id), default=str).encode()
+        return '"%s"' % hashlib.sha1(body).hexdigest()[:20], body
+
+    async def response(self, path, site_id):
+        """Return (etag, body), rebuilding at most once per TTL per key"""
+        key = (path, site_id)
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        # Concurrent requests for the same key share a single build
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.get_running_loop().run_in_executor(None, self.render, path, site_id)
+            pending.add_done_callback(lambda future: self._store(key, future))
+            self._pending[key] = pending
+        return await pending
+
+    def _store(self, key, future):
+        del self._pending[key]
+        if not future.cancelled() and future.exception() is None:
+            self._cache[key] = (time.monotonic() + self.ttl, future.result())
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection, honouring HTTP/1.1 keep-alive"""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode('latin-1').split()
+                keep_alive = (len(parts) == 3 and parts[2] == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                await self.respond(writer, parts, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, parts, headers, keep_alive):
+        if len(parts) != 3:
+            return await self.send(writer, 400, {'error': 'bad request'}, keep_alive)
+        method, target = parts[0], urlsplit(parts[1])
+        if method not in ('GET', 'HEAD'):
+            return await self.send(writer, 405, {'error': 'read-only API'}, keep_alive)
+
+        site_id = parse_qs(target.query).get('site', [None])[0]
+        try:
+            etag, body = await self.response(target.path.rstrip('/'), site_id)
+        except NotFound as e:
+            return await self.send(writer, 404, {'error': str(e)}, keep_alive)
+        except Exception as e:
+            return await self.send(writer, 503, {'error': str(e)}, keep_alive)
+
+        if etag_matches(headers.get('if-none-match'), etag):
+            return await self.send_raw(writer, 304, b'', keep_alive, etag=etag)
+        await self.send_raw(writer, 200, b'' if method == 'HEAD' else body, keep_alive, etag=etag,
+                            length=len(body))
+
+    async def send(self, writer, status, payload, keep_alive):
+        await self.send_raw(writer, status, json.dumps(payload).encode(), keep_alive)
+
+    async def send_raw(self, writer, status, body, keep_alive, etag=None, length=None):
+        lines = [
+            f'HTTP/1.1 {status} {REASONS[status]}',
+            'Content-Type: application/json',
+            f'Cache-Control: public, max-age={self.ttl}' if etag else 'Cache-Control: no-store',
+            'Access-Control-Allow-Origin: *',
+            f'Connection: {"keep-alive" if keep_alive else "close"}',
+        ]
+        if status != 304:
+            lines.append(f'Content-Length: {len(body) if length is None else length}')
+        if etag:
+            lines.append(f'ETag: {etag}')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def serve(self, host=API_HOST, port=API_PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def start_background_api(router, host=API_HOST, port=API_PORT):
+    """Run the API on a daemon thread with its own event loop"""
+    api = MetricsAPI(router)
+    thread = threading.Thread(target=asyncio.run, args=(api.serve(host, port),), name='metrics-api', daemon=True)
+    thread.start()
+    return api
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the read-only metrics API")
+    parser.add_argument('--host', default=API_HOST)
+    parser.add_argument('--port', type=int, default=API_PORT)
+    args = parser.parse_args(argv)
+
+    sites = load_sites()
+    local = [site['id'] for site in sites if not site.get('address')]
+    if local:
+        parser.error(f"site(s) {', '.join(local)} have no 'address'. Standalone mode reads sites through "
+                     "their site workers; serve them with `python -m watersustain.sites serve` or set "
+                     "WATER_API_PORT to run the API inside the dashboard")
+    api = MetricsAPI(SiteRouter(sites))
+    print(f"Serving metrics API on http://{args.host}:{args.port}/api/")
+    try:
+        asyncio.run(api.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""Append-only event log with periodic snapshots.
+
+Every change to a site partition is written here before it is applied. A
+site directory holds:
+
+    log-<first seq>.jsonl   events, one JSON object per line
+    snapshot-<seq>.pkl      full partition state after event <seq>
+
+Startup loads the newest snapshot and replays only the log tail written
+after it. Log segments are kept as the audit trail, and together with the
+retained snapshots they allow any earlier state to be rebuilt.
+"""
+import datetime
+import glob
+import json
+import os
+import pickle
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.environ.get('WATER_DATA_DIR', os.path.join(BASE_DIR, 'data'))
+SNAPSHOT_EVERY = 500
+KEEP_SNAPSHOTS = 10
+
+
+def encode_timestamp(value):
+    """JSON fallback that writes datetimes as ISO 8601 strings"""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"cannot serialize {type(value).__name__}")
+
+
+def _seq_of(path):
+    return int(os.path.basename(path).split('-', 1)[1].split('.', 1)[0])
+
+
+class EventLog:
+    """Write-ahead log and snapshots for one site"""
+
+    def __init__(self, directory, snapshot_every=SNAPSHOT_EVERY, fsync=True):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.seq = 0
+        self._since_snapshot = 0
+        self._segment_start = 1
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _segments(self):
+        return sorted(glob.glob(os.path.join(self.directory, 'log-*.jsonl')), key=_seq_of)
+
+    def _snapshots(self):
+        return sorted(glob.glob(os.path.join(self.directory, 'snapshot-*.pkl')), key=_seq_of)
+
+    def _sync(self, f):
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def append(self, kind, data):
+        """Durably append an event and return it"""
+        if self._file is None:
+            path = os.path.join(self.directory, f'log-{self._segment_start:012d}.jsonl')
+            self._file = open(path, 'a', encoding='utf-8')
+        self.seq += 1
+        event = {'seq': self.seq, 'time': datetime.datetime.now().isoformat(), 'type': kind, 'data': data}
+        self._file.write(json.dumps(event, default=encode_timestamp) + '\n')
+        self._sync(self._file)
+        self._since_snapshot += 1
+        return event
+
+    def should_snapshot(self):
+        return self._since_snapshot >= self.snapshot_every
+
+    def snapshot(self, state):
+        """Write the state as of the latest event and start a new log segment"""
+        path = os.path.join(self.directory, f'snapshot-{self.seq:012d}.pkl')
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump({'seq': self.seq, 'time': datetime.datetime.now(), 'state': state}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+            self._sync(f)
+        os.replace(path + '.tmp', path)
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._segment_start = self.seq + 1
+        self._since_snapshot = 0
+
+        # Keep the first snapshot as the base for rebuilding any point in time
+        snapshots = self._snapshots()
+        for old in snapshots[1:-KEEP_SNAPSHOTS]:
+            os.remove(old)
+
+    def load_snapshot(self, max_seq=None):
+        """Return the newest snapshot at or before ``max_seq``, or None"""
+        for path in reversed(self._snapshots()):
+            if max_seq is None or _seq_of(path) <= max_seq:
+                with open(path, 'rb') as f:
+                    return pickle.load(f)
+        return None
+
+    def events(self, after=0, until=None):
+        """Yield logged events with seq > ``after`` and time <= ``until``"""
+        until = until.isoformat() if until is not None else None
+        segments = self._segments()
+        for i, path in enumerate(segments):
+            # A segment only holds events before the next segment starts
+            if i + 1 < len(segments) and _seq_of(segments[i + 1]) <= after + 1:
+                continue
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        return  # torn write at the end of the log
+                    if event['seq'] <= after:
+                        continue
+                    if until is not None and event['time'] > until:
+                        return
+                    yield event
+
+    def _repair_tail(self):
+        """Cut a partially written last line left by a crash"""
+        segments = self._segments()
+        if not segments:
+            return
+        with open(segments[-1], 'rb+') as f:
+            data = f.read()
+            end = data.rfind(b'\n') + 1
+            if end != len(data):
+                f.truncate(end)
+
+    def recover(self):
+        """Return (snapshot state or None, events logged after it)"""
+        self._repair_tail()
+        snapshot = self.load_snapshot()
+        after = snapshot['seq'] if snapshot else 0
+        tail = list(self.events(after=after))
+
+        self.seq = tail[-1]['seq'] if tail else after
+        self._segment_start = after + 1
+        self._since_snapshot = len(tail)
+        return (snapshot['state'] if snapshot else None), tail
+
+    def _seq_at(self, when):
+        """Seq of the last event logged at or before ``when``, or 0"""
+        until = when.isoformat()
+        # Segments are in time order, so only the newest one starting by ``when`` is scanned
+        for path in reversed(self._segments()):
+            with open(path, encoding='utf-8') as f:
+                first = f.readline()
+            try:
+                if json.loads(first)['time'] > until:
+                    continue
+            except ValueError:
+                continue  # empty, or only a torn write
+            target = _seq_of(path) - 1
+            for event in self.events(after=target, until=when):
+                target = event['seq']
+            return target
+        return 0
+
+    def state_at(self, when):
+        """Return (snapshot state, events to replay) to rebuild the state at ``when``"""
+        target = self._seq_at(when)
+        snapshot = self.load_snapshot(max_seq=target)
+        if snapshot is None or (snapshot['seq'] == 0 and snapshot['time'] > when):
+            return None, []  # the site did not exist yet
+        return snapshot['state'], list(self.events(after=snapshot['seq'], until=when))
+
+    def recent(self, limit=50):
+        """Return the newest ``limit`` events, newest first"""
+        events = []
+        for path in reversed(self._segments()):
+            with open(path, encoding='utf-8') as f:
+                lines = f.readlines()
+            for line in reversed(lines):
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+                if len(events) >= limit:
+                    return events
+        return events
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,28 @@
+"""Hourly power supply and demand forecasts"""
+import datetime
+import zlib
+
+import numpy as np
+
+from watersustain.solar import DEFAULT_CLOUD_DERATE, hourly_profile
+
+
+def forecast_rng(site, day):
+    """Random generator seeded by site and day, so a day's forecast is stable"""
+    return np.random.default_rng([zlib.crc32(site['id'].encode()), day.toordinal()])
+
+
+def hourly_power_forecast(site, solar_capacity_kw, day=None, cloud_derate=DEFAULT_CLOUD_DERATE, rng=None):
+    """Forecast solar supply, demand and the grid shortfall for each hour of the day"""
+    day = day or datetime.date.today()
+    rng = rng or forecast_rng(site, day)
+    hours = np.arange(24)
+    solar = hourly_profile(day, site['lat'], site['lon'], solar_capacity_kw, cloud_derate=cloud_derate)
+    demand = 20 + 10 * np.sin((hours - 8) * np.pi / 16) + rng.normal(0, 2, hours.size)
+
+    return {
+        'Hour': hours,
+        'Solar Available': solar,
+        'Predicted Demand': demand,
+        'Grid Required': np.maximum(0, demand - solar)
+    }
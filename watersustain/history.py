@@ -0,0 +1,85 @@
+"""Hourly power and water usage readings.
+
+Until live meters are wired in, the history is seeded from the current
+dashboard figures with a fixed random seed so every session starts from the
+same record. Readings are plain dicts:
+
+    power: {'timestamp', 'solar_kwh', 'grid_kwh', 'generator_kwh', 'hours'}
+    usage: {'timestamp', 'region', 'usage_l', 'capacity_l'}
+
+Each reading covers the interval starting at its timestamp: ``hours`` long
+for power readings that carry it, otherwise one hour.
+"""
+import datetime
+import math
+import random
+
+# Share of a day's water drawn in each hour, peaking late morning and evening
+HOURLY_USAGE_WEIGHTS = [
+    0.010, 0.008, 0.008, 0.010, 0.020, 0.040, 0.060, 0.065, 0.060, 0.055, 0.060, 0.065,
+    0.060, 0.055, 0.050, 0.045, 0.045, 0.050, 0.060, 0.055, 0.045, 0.030, 0.025, 0.019
+]
+GRID_OUTAGE_PROBABILITY = 0.15
+
+
+def history_start(now, months=6):
+    """First day of the month ``months - 1`` months before ``now``"""
+    month_index = now.year * 12 + now.month - 1 - (months - 1)
+    return datetime.datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def power_reading(timestamp, solar_kw, grid_kw, generator_kw, hours=1.0):
+    return {
+        'timestamp': timestamp,
+        'solar_kwh': solar_kw * hours,
+        'grid_kwh': grid_kw * hours,
+        'generator_kwh': generator_kw * hours,
+        'hours': hours,
+    }
+
+
+def reading_end(reading):
+    """End of the interval a reading covers"""
+    return reading['timestamp'] + datetime.timedelta(hours=reading.get('hours', 1.0))
+
+
+def generate_history(water_data, electrical_data, now=None, months=6, seed=42):
+    """Generate hourly power and per-region usage readings up to ``now``"""
+    now = now or datetime.datetime.now()
+    rng = random.Random(seed)
+    start = history_start(now, months)
+    hours = int((now - start).total_seconds() // 3600)
+
+    solar = electrical_data['solar']
+    grid = electrical_data['grid']
+    generator = electrical_data['generator']
+
+    power_history = []
+    usage_history = []
+    cloud_factor = 1.0
+    for i in range(hours):
+        timestamp = start + datetime.timedelta(hours=i)
+        hour = timestamp.hour
+        progress = i / max(hours - 1, 1)  # solar share grows as panels were added
+
+        if hour == 0:
+            cloud_factor = rng.uniform(0.55, 1.0)
+        daylight = max(0.0, math.sin((hour - 6) * math.pi / 12)) if 6 <= hour <= 18 else 0.0
+        solar_kw = min(solar['capacity'], solar['current'] * daylight * cloud_factor * (0.7 + 0.4 * progress))
+
+        grid_kw = grid['current'] * rng.uniform(0.8, 1.1)
+        generator_kw = generator['current'] * rng.uniform(0.1, 0.4)
+        if rng.random() < GRID_OUTAGE_PROBABILITY:
+            generator_kw += grid_kw
+            grid_kw = 0.0
+        power_history.append(power_reading(timestamp, solar_kw, grid_kw, min(generator_kw, generator['capacity'])))
+
+        for region in water_data['regions']:
+            usage_history.append({
+                'timestamp': timestamp,
+                'region': region['name'],
+                'usage_l': region['usage'] * HOURLY_USAGE_WEIGHTS[hour] * rng.uniform(0.85, 1.15),
+                'capacity_l': region['capacity'] / 24,
+            })
+
+    return power_history, usage_history
@@ -0,0 +1,86 @@
+"""Status, efficiency and alert calculations used across the dashboard views.
+
+Everything here works on the plain session state dicts and has no Streamlit
+or plotting dependency, so it can be imported and tested on its own.
+"""
+
+POWER_SOURCES = ('solar', 'grid', 'generator')
+UTILIZATION_TARGET = 85.0  # above this the footer reports High Load
+
+
+def utilization(usage, capacity):
+    return (usage / capacity) * 100
+
+
+def get_status_class(usage, capacity):
+    percentage = utilization(usage, capacity)
+    if percentage < 60:
+        return "status-good"
+    elif percentage < 80:
+        return "status-warning"
+    else:
+        return "status-danger"
+
+
+def get_status_text(usage, capacity):
+    percentage = utilization(usage, capacity)
+    if percentage < 60:
+        return "Normal"
+    elif percentage < 80:
+        return "High Usage"
+    else:
+        return "Critical"
+
+
+def region_totals(regions):
+    """Return (total_users, total_usage) summed over the regions"""
+    total_users = sum(r['users'] for r in regions)
+    total_usage = sum(r['usage'] for r in regions)
+    return total_users, total_usage
+
+
+def per_capita_usage(total_usage, active_users):
+    return (total_usage / active_users) * 1000
+
+
+def system_efficiency(regions):
+    """Share of total regional capacity currently in use, in percent"""
+    total_capacity = sum(r['capacity'] for r in regions)
+    total_usage = sum(r['usage'] for r in regions)
+    return (total_usage / total_capacity) * 100
+
+
+def total_power(electrical_data):
+    return sum(electrical_data[source]['current'] for source in POWER_SOURCES)
+
+
+def renewable_percentage(electrical_data):
+    return electrical_data['solar']['current'] / total_power(electrical_data) * 100
+
+
+def utilization_score(utilization_pct, target=UTILIZATION_TARGET):
+    """100 up to the utilization target, one point less per point of overload"""
+    return max(0.0, 100 - max(0.0, utilization_pct - target))
+
+
+def sustainability_score(renewable_ratio, water_efficiency):
+    return renewable_ratio * 0.4 + water_efficiency * 0.6
+
+
+def build_alerts(water_data, electrical_data):
+    """List alert messages for high regional usage and generator use"""
+    alerts = []
+
+    # Check for high usage regions
+    for region in water_data['regions']:
+        util = utilization(region['usage'], region['capacity'])
+        if util > 90:
+            alerts.append(f"Critical usage in {region['name']}")
+        elif util > 80:
+            alerts.append(f"High usage in {region['name']}")
+
+    # Check power status
+    if electrical_data['generator']['current'] > 10:
+        alerts.append("Generator backup in use")
+
+    return alerts
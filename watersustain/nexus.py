@@ -0,0 +1,87 @@
+"""Water-energy nexus: energy and cost per cubic metre of water pumped.
+
+Usage readings are matched to the power reading in effect when they were
+taken (an as-of join on sorted timestamps). Each power interval's energy is
+then split across regions in proportion to the volume they drew during it,
+and the result is rolled up per region and hour. Energy spent in intervals
+with no recorded usage is not attributed to any region.
+"""
+import numpy as np
+import pandas as pd
+
+from watersustain.scoring import GRID_TARIFF, POWER_FIELDS
+
+GENERATOR_COST = 360.0  # naira per kWh from the diesel generator (~0.3 L/kWh at ₦1,200/L)
+
+NEXUS_COLUMNS = ['region', 'timestamp', 'volume_m3', 'energy_kwh', 'energy_cost', 'kwh_per_m3', 'cost_per_m3']
+
+
+def power_frame(readings):
+    """Build a power DataFrame from reading dicts"""
+    frame = pd.DataFrame.from_records(readings, columns=['timestamp', *POWER_FIELDS])
+    # Typed even when empty, so the as-of join always sees matching datetime keys
+    frame['timestamp'] = frame['timestamp'].astype('datetime64[ns]')
+    return frame
+
+
+def usage_frame(readings):
+    """Build a usage DataFrame from reading dicts"""
+    frame = pd.DataFrame.from_records(readings, columns=['timestamp', 'region', 'usage_l'])
+    frame['timestamp'] = frame['timestamp'].astype('datetime64[ns]')
+    frame['region'] = frame['region'].astype('category')
+    return frame
+
+
+def energy_per_volume(usage, power, freq='h', tolerance=None):
+    """Attribute energy to regions and aggregate kWh/m³ and cost/m³.
+
+    ``usage`` needs ``timestamp``, ``region`` and ``usage_l`` columns and
+    ``power`` needs ``timestamp`` plus the kWh columns in ``POWER_FIELDS``,
+    each row covering the interval until the next reading. ``tolerance``
+    limits how stale a power reading may be before usage is left unmatched.
+    Returns one row per region and ``freq`` period.
+    """
+    power = power.sort_values('timestamp', kind='stable', ignore_index=True)
+    energy = power[list(POWER_FIELDS)].to_numpy(dtype=float)
+    interval_energy = energy.sum(axis=1)
+    interval_cost = energy[:, 1] * GRID_TARIFF + energy[:, 2] * GENERATOR_COST
+
+    usage = usage.sort_values('timestamp', kind='stable', ignore_index=True)
+    intervals = pd.DataFrame({'timestamp': power['timestamp'], 'interval': np.arange(len(power))})
+    joined = pd.merge_asof(usage, intervals, on='timestamp', direction='backward', tolerance=tolerance)
+    joined = joined[joined['interval'].notna()]
+
+    interval = joined['interval'].to_numpy(dtype=np.int64)
+    volume = joined['usage_l'].to_numpy(dtype=float)
+    interval_volume = np.bincount(interval, weights=volume, minlength=len(power))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = np.where(interval_volume[interval] > 0, volume / interval_volume[interval], 0.0)
+
+    attributed = pd.DataFrame({
+        'region': joined['region'].to_numpy(),
+        'timestamp': joined['timestamp'].dt.floor(freq).to_numpy(),
+        'volume_m3': volume / 1000,
+        'energy_kwh': share * interval_energy[interval],
+        'energy_cost': share * interval_cost[interval],
+    })
+    table = attributed.groupby(['region', 'timestamp'], observed=True, sort=True).sum().reset_index()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table['kwh_per_m3'] = np.where(table['volume_m3'] > 0, table['energy_kwh'] / table['volume_m3'], np.nan)
+        table['cost_per_m3'] = np.where(table['volume_m3'] > 0, table['energy_cost'] / table['volume_m3'], np.nan)
+    return table[NEXUS_COLUMNS]
+
+
+def build_nexus_table(power_history, usage_history, freq='h'):
+    """Materialize the per-region nexus table from reading dicts"""
+    return energy_per_volume(usage_frame(usage_history), power_frame(power_history), freq=freq)
+
+
+def region_summary(table, since=None):
+    """Total volume, energy and cost per region with overall kWh/m³ and cost/m³"""
+    if since is not None:
+        table = table[table['timestamp'] >= since]
+    summary = table.groupby('region', observed=True)[['volume_m3', 'energy_kwh', 'energy_cost']].sum()
+    summary['kwh_per_m3'] = summary['energy_kwh'] / summary['volume_m3']
+    summary['cost_per_m3'] = summary['energy_cost'] / summary['volume_m3']
+    return summary.reset_index()
@@ -0,0 +1,120 @@
+"""Sustainability scoring over rolling windows of the reading history.
+
+The engine keeps running totals instead of rescanning history: each new
+reading is added to a trailing window (and to its calendar month), and
+readings that fall out of the window are subtracted as it moves forward.
+"""
+import datetime
+from collections import deque
+
+from watersustain.metrics import sustainability_score, utilization_score
+
+GRID_EMISSION_FACTOR = 0.43  # kg CO2 per kWh, Nigerian grid average
+GENERATOR_EMISSION_FACTOR = 0.80  # kg CO2 per kWh, diesel generator set
+GRID_TARIFF = 225.0  # naira per kWh bought from the grid
+
+POWER_FIELDS = ('solar_kwh', 'grid_kwh', 'generator_kwh')
+USAGE_FIELDS = ('usage_l', 'capacity_l')
+DEFAULT_WINDOW = datetime.timedelta(days=30)
+
+
+class RollingTotals:
+    """Sums of reading fields over a trailing time window"""
+
+    def __init__(self, span, fields):
+        self.span = span
+        self.fields = fields
+        self.totals = dict.fromkeys(fields, 0.0)
+        self._readings = deque()
+
+    def add(self, reading):
+        self._readings.append(reading)
+        for field in self.fields:
+            self.totals[field] += reading[field]
+
+    def advance(self, now):
+        """Drop readings older than the window ending at ``now``"""
+        cutoff = now - self.span
+        while self._readings and self._readings[0]['timestamp'] <= cutoff:
+            expired = self._readings.popleft()
+            for field in self.fields:
+                self.totals[field] -= expired[field]
+
+
+def summarize(totals):
+    """Turn energy and water totals into the sustainability figures"""
+    solar = totals.get('solar_kwh', 0.0)
+    grid = totals.get('grid_kwh', 0.0)
+    generator = totals.get('generator_kwh', 0.0)
+    energy = solar + grid + generator
+    capacity = totals.get('capacity_l', 0.0)
+
+    return {
+        'energy_kwh': energy,
+        'renewable_pct': (solar / energy) * 100 if energy else 0.0,
+        'co2_tons': (grid * GRID_EMISSION_FACTOR + generator * GENERATOR_EMISSION_FACTOR) / 1000,
+        'cost_savings': solar * GRID_TARIFF,
+        'utilization_pct': (totals.get('usage_l', 0.0) / capacity) * 100 if capacity else 0.0,
+    }
+
+
+class SustainabilityEngine:
+    """Incrementally maintained sustainability metrics.
+
+    ``snapshot()`` describes the trailing window (30 days by default) and
+    ``monthly_series()`` the per-month aggregates behind the trend chart.
+    Readings are expected roughly in time order.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.power_window = RollingTotals(window, POWER_FIELDS)
+        self.usage_window = RollingTotals(window, USAGE_FIELDS)
+        self.monthly = {}
+        self.latest = None
+
+    def _add_to_month(self, reading, fields):
+        timestamp = reading['timestamp']
+        bucket = self.monthly.setdefault(
+            (timestamp.year, timestamp.month), dict.fromkeys(POWER_FIELDS + USAGE_FIELDS, 0.0)
+        )
+        for field in fields:
+            bucket[field] += reading[field]
+
+    def _record(self, reading, window):
+        timestamp = reading['timestamp']
+        if self.latest is None or timestamp > self.latest:
+            self.latest = timestamp
+        self._add_to_month(reading, window.fields)
+        window.add(reading)
+        self.power_window.advance(self.latest)
+        self.usage_window.advance(self.latest)
+
+    def record_power(self, reading):
+        self._record(reading, self.power_window)
+
+    def record_usage(self, reading):
+        self._record(reading, self.usage_window)
+
+    def extend(self, power_readings=(), usage_readings=()):
+        for reading in power_readings:
+            self.record_power(reading)
+        for reading in usage_readings:
+            self.record_usage(reading)
+
+    def snapshot(self):
+        """Sustainability figures for the trailing window"""
+        return summarize({**self.power_window.totals, **self.usage_window.totals})
+
+    def score(self):
+        """Renewable share plus how well capacity utilization stays within its target"""
+        snapshot = self.snapshot()
+        return sustainability_score(snapshot['renewable_pct'], utilization_score(snapshot['utilization_pct']))
+
+    def monthly_series(self, months=6):
+        """Per-month figures for the most recent ``months`` months, oldest first"""
+        series = []
+        for year, month in sorted(self.monthly)[-months:]:
+            row = summarize(self.monthly[(year, month)])
+            row['month'] = datetime.date(year, month, 1).strftime('%b %Y')
+            series.append(row)
+        return series
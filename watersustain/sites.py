@@ -0,0 +1,529 @@
+"""Site partitioning so one deployment can serve many communities.
+
+Each site (town) owns one ``SitePartition`` holding its regions, power
+sources, readings and scoring engine. Partitions either live in the
+dashboard process or run as site workers in their own process or host:
+
+    python -m watersustain.sites serve --site jebba --port 6001
+
+``SiteRouter`` sends each query to the right partition, local or remote, and
+builds the network-wide overview by merging the small per-site summaries
+rather than scanning readings. Sites are configured in the JSON file named by
+``WATER_SITES_CONFIG`` (see ``sites.example.json``); without one the
+deployment serves Malete only.
+"""
+import argparse
+import copy
+import datetime
+import json
+import os
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from watersustain.eventlog import DATA_DIR, EventLog, encode_timestamp
+from watersustain.history import generate_history, power_reading, reading_end
+from watersustain.metrics import build_alerts, region_totals
+from watersustain.scoring import POWER_FIELDS, USAGE_FIELDS, SustainabilityEngine, summarize
+from watersustain.state import DEFAULT_ELECTRICAL_DATA, DEFAULT_USER_METRICS, DEFAULT_WATER_DATA
+
+SITES_CONFIG = os.environ.get('WATER_SITES_CONFIG')
+# Shared secret for site workers; there is deliberately no default
+AUTHKEY = os.environ.get('WATER_SITES_AUTHKEY', '').encode() or None
+BILLING_DAYS = 30
+
+MALETE = {
+    'id': 'malete',
+    'name': 'Malete',
+    'state': 'Kwara State',
+    'lat': 8.95,
+    'lon': 5.35,
+    # Approximate coordinates for the Malete regions
+    'coordinates': {
+        'Central Malete': [8.95, 5.35],
+        'North District': [8.97, 5.33],
+        'South District': [8.93, 5.34],
+        'East Quarter': [8.96, 5.37],
+    },
+    # Overrides of billing.DEFAULT_TARIFF
+    'tariff': {
+        'region_surcharges': {'Central Malete': 0.0, 'North District': 0.05,
+                              'South District': 0.05, 'East Quarter': 0.10},
+    },
+    'water_data': DEFAULT_WATER_DATA,
+    'electrical_data': DEFAULT_ELECTRICAL_DATA,
+    'user_metrics': DEFAULT_USER_METRICS,
+}
+
+SITE_KEYS = ('id', 'name', 'state', 'lat', 'lon')
+# Seed data a site needs wherever its partition runs
+SEED_KEYS = ('water_data', 'electrical_data', 'user_metrics')
+
+# Methods a site worker answers on behalf of its partition
+PARTITION_METHODS = (
+    'state', 'summary', 'update_region', 'set_power', 'record_reading',
+    'sustainability', 'monthly_series', 'score', 'nexus_table',
+    'recent_events', 'region_at', 'billing_period', 'billing_accounts', 'billing_summary',
+)
+# Methods that change a partition; never resent once they may have reached the worker
+WRITE_METHODS = ('update_region', 'set_power', 'record_reading')
+
+
+class SiteUnavailable(Exception):
+    """A site worker could not be reached"""
+
+
+def parse_timestamp(value):
+    return datetime.datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def validate_site(site, local=True):
+    """Raise ValueError naming any keys a site definition lacks"""
+    missing = [key for key in SITE_KEYS + (SEED_KEYS if local else ()) if key not in site]
+    if missing:
+        raise ValueError(f"site {site.get('id', '<no id>')!r} in the sites config is missing "
+                         f"{', '.join(missing)}")
+
+
+def site_info(site):
+    """Site metadata without the seed data blocks"""
+    return {key: value for key, value in site.items()
+            if key not in ('water_data', 'electrical_data', 'user_metrics')}
+
+
+def region_coordinates(site, region_name):
+    """Return [lat, lon] for a region, falling back to the site centre"""
+    return site.get('coordinates', {}).get(region_name, [site['lat'], site['lon']])
+
+
+class SitePartition:
+    """All data for one site, kept in the process that serves it.
+
+    With a ``data_dir`` every change is appended to the site's event log
+    before it is applied, so the partition survives restarts and keeps an
+    audit trail (see ``watersustain.eventlog``).
+    """
+
+    def __init__(self, site, data_dir=DATA_DIR):
+        self.site = site_info(site)
+        self._lock = threading.RLock()
+        self._nexus = (None, None)
+        self._billing = (None, None)
+        self.log = EventLog(os.path.join(data_dir, self.site['id'])) if data_dir else None
+
+        state, tail = self.log.recover() if self.log else (None, [])
+        if state is None:
+            self._seed(site)
+        else:
+            self._restore(state)
+        for event in tail:
+            self._apply(event)
+        if self.log and state is None:
+            self.log.snapshot(self._state_for_snapshot())
+
+    def _seed(self, site):
+        self.water_data = copy.deepcopy(site['water_data'])
+        self.electrical_data = copy.deepcopy(site['electrical_data'])
+        self.user_metrics = copy.deepcopy(site['user_metrics'])
+
+        self.power_history, self.usage_history = generate_history(self.water_data, self.electrical_data)
+        self.engine = SustainabilityEngine()
+        self.engine.extend(self.power_history, self.usage_history)
+
+    def _restore(self, state):
+        self.water_data = state['water_data']
+        self.electrical_data = state['electrical_data']
+        self.user_metrics = state['user_metrics']
+        self.power_history = state['power_history']
+        self.usage_history = state['usage_history']
+        self.engine = state['engine']
+
+    def _state_for_snapshot(self):
+        # Pickled together so the engine's windows keep sharing the history readings
+        return {
+            'water_data': self.water_data,
+            'electrical_data': self.electrical_data,
+            'user_metrics': self.user_metrics,
+            'power_history': self.power_history,
+            'usage_history': self.usage_history,
+            'engine': self.engine,
+        }
+
+    def _apply(self, event):
+        """Apply a logged event to the in-memory state"""
+        data = event['data']
+        if event['type'] == 'region_updated':
+            self.water_data['regions'][data['index']] = data['record']
+
+            total_users, total_usage = region_totals(self.water_data['regions'])
+            self.user_metrics['total_users'] = total_users
+            self.user_metrics['active_users'] = int(total_users * 0.86)  # Assume 86% active
+            self.water_data['total_usage'] = total_usage
+        elif event['type'] == 'power_set':
+            # Meter the old loads up to the change, then switch to the new ones
+            reading = self._metered_power(parse_timestamp(data['timestamp']))
+            if reading is not None:
+                self._add_reading('power', reading)
+            self.electrical_data['solar']['current'] = data['solar']
+            self.electrical_data['grid']['current'] = data['grid']
+            self.electrical_data['generator']['current'] = data['generator']
+        elif event['type'] == 'reading':
+            self._add_reading(data['kind'], {**data['reading'],
+                                             'timestamp': parse_timestamp(data['reading']['timestamp'])})
+        else:
+            raise ValueError(f"unknown event type {event['type']!r}")
+
+    def _metered_power(self, until):
+        """Energy at the current loads from the end of the last power reading to ``until``"""
+        if not self.power_history:
+            return None
+        start = reading_end(self.power_history[-1])
+        hours = (until - start).total_seconds() / 3600
+        if hours <= 0:
+            return None  # already covered by the last reading
+        return power_reading(start, self.electrical_data['solar']['current'],
+                             self.electrical_data['grid']['current'],
+                             self.electrical_data['generator']['current'], hours)
+
+    def _add_reading(self, kind, reading):
+        if kind == 'power':
+            self.power_history.append(reading)
+            self.engine.record_power(reading)
+        else:
+            self.usage_history.append(reading)
+            self.engine.record_usage(reading)
+
+    def _record(self, kind, data):
+        """Log a change, apply it and snapshot when the log tail grows long"""
+        with self._lock:
+            event = self.log.append(kind, data) if self.log else {'type': kind, 'data': data}
+            # Apply the event as it will be read back, so replay matches the live state
+            self._apply(json.loads(json.dumps(event, default=encode_timestamp)))
+            if self.log and self.log.should_snapshot():
+                self.log.snapshot(self._state_for_snapshot())
+
+    def state(self):
+        return {
+            'site': self.site,
+            'water_data': self.water_data,
+            'electrical_data': self.electrical_data,
+            'user_metrics': self.user_metrics,
+        }
+
+    def update_region(self, index, record):
+        """Replace a region record and refresh the site totals"""
+        self._record('region_updated', {'index': index, 'record': record})
+
+    def set_power(self, solar, grid, generator, timestamp):
+        """Set the current load of each power source from ``timestamp`` on.
+
+        The energy drawn at the previous loads since the last power reading is
+        recorded first, so repeated changes never count the same time twice.
+        """
+        loads = {'solar': solar, 'grid': grid, 'generator': generator}
+        for source, load in loads.items():
+            capacity = self.electrical_data[source]['capacity']
+            if not 0 <= load <= capacity:
+                raise ValueError(f"{source} load {load} kW is outside 0-{capacity} kW")
+        self._record('power_set', {'solar': solar, 'grid': grid, 'generator': generator, 'timestamp': timestamp})
+
+    def record_reading(self, kind, reading):
+        """Record a 'power' or 'usage' meter reading"""
+        if kind not in ('power', 'usage'):
+            raise ValueError(f"unknown reading kind {kind!r}")
+        self._record('reading', {'kind': kind, 'reading': reading})
+
+    def recent_events(self, limit=50):
+        """Newest entries of the change log, newest first"""
+        return self.log.recent(limit) if self.log else []
+
+    def region_at(self, region_name, when):
+        """Rebuild a region's record as it stood at ``when`` from the log"""
+        if self.log is None:
+            return None
+        state, events = self.log.state_at(when)
+        if state is None:
+            return None
+        past = SitePartition.__new__(SitePartition)
+        past._restore(state)
+        for event in events:
+            past._apply(event)
+        return next((r for r in past.water_data['regions'] if r['name'] == region_name), None)
+
+    def sustainability(self):
+        return self.engine.snapshot()
+
+    def monthly_series(self, months=6):
+        return self.engine.monthly_series(months)
+
+    def score(self):
+        return self.engine.score()
+
+    def nexus_table(self):
+        """Per-region nexus table, rebuilt only when new readings arrive"""
+        from watersustain.nexus import build_nexus_table
+
+        with self._lock:
+            version = (len(self.power_history), len(self.usage_history))
+            if self._nexus[0] != version:
+                self._nexus = (version, build_nexus_table(self.power_history, self.usage_history))
+            return self._nexus[1]
+
+    def _billing_window(self, days):
+        # The billing period ends with (and includes) the latest usage reading
+        end = self.usage_history[-1]['timestamp'] if self.usage_history else datetime.datetime.now()
+        end += datetime.timedelta(microseconds=1)
+        return end - datetime.timedelta(days=days), end
+
+    def billing_period(self, days=BILLING_DAYS):
+        """Invoice label of the billing period ending at the latest reading"""
+        from watersustain.billing import period_label
+
+        with self._lock:
+            return period_label(*self._billing_window(days))
+
+    def billing_accounts(self, days=BILLING_DAYS):
+        """Per-account consumption for the billing period ending at the latest reading"""
+        from watersustain.billing import accounts_from_regions, period_usage
+
+        with self._lock:
+            usage_l = period_usage(self.usage_history, *self._billing_window(days))
+            return accounts_from_regions(self.water_data['regions'], usage_l)
+
+    def billing_summary(self, days=BILLING_DAYS):
+        """Per-region bill run totals, rebuilt only when readings or regions change"""
+        from watersustain.billing import RunTotals, bill_chunks, site_tariff
+
+        with self._lock:
+            version = (days, len(self.usage_history), tuple((r['name'], r['users']) for r in self.water_data['regions']))
+            if self._billing[0] != version:
+                period = self.billing_period(days)
+                totals = RunTotals()
+                for invoices in bill_chunks(self.billing_accounts(days), period, site_tariff(self.site)):
+                    totals.add(invoices)
+                self._billing = (version, {'period': period, 'regions': totals.by_region().to_dict('records'),
+                                           'overall': totals.overall()})
+            return self._billing[1]
+
+    def summary(self):
+        """Small pre-aggregate of the site used by the network overview"""
+        with self._lock:
+            regions = self.water_data['regions']
+            return {
+                'site_id': self.site['id'],
+                'name': self.site['name'],
+                'lat': self.site['lat'],
+                'lon': self.site['lon'],
+                'regions': len(regions),
+                'total_usage': sum(r['usage'] for r in regions),
+                'total_capacity': sum(r['capacity'] for r in regions),
+                'total_users': self.user_metrics['total_users'],
+                'active_users': self.user_metrics['active_users'],
+                'power_kw': {source: data['current'] for source, data in self.electrical_data.items()},
+                'window_totals': {**self.engine.power_window.totals, **self.engine.usage_window.totals},
+                'alerts': build_alerts(self.water_data, self.electrical_data),
+            }
+
+
+class RemotePartition:
+    """Proxy for a partition served by a site worker in another process"""
+
+    def __init__(self, site, address, authkey=AUTHKEY):
+        if not authkey:
+            raise ValueError(f"Site {site['id']} is served by a site worker; set WATER_SITES_AUTHKEY")
+        self.site = site_info(site)
+        self.address = address
+        self.authkey = authkey
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _call(self, method, *args):
+        with self._lock:
+            for attempt in range(2):
+                sent = False
+                try:
+                    if self._conn is None:
+                        self._conn = Client(self.address, authkey=self.authkey)
+                    self._conn.send((method, args))
+                    sent = True
+                    status, result = self._conn.recv()
+                    break
+                except (OSError, EOFError, AuthenticationError) as e:
+                    self._disconnect()
+                    # A write whose reply was lost may already be logged and applied
+                    if attempt or (sent and method in WRITE_METHODS):
+                        raise SiteUnavailable(f"site worker {self.site['id']} is unreachable ({e!r})") from e
+        if status == 'error':
+            raise RuntimeError(f"Site worker {self.site['id']} failed: {result}")
+        return result
+
+    def _disconnect(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+
+    def __getattr__(self, name):
+        if name not in PARTITION_METHODS:
+            raise AttributeError(name)
+        return lambda *args: self._call(name, *args)
+
+
+def merge_summaries(summaries):
+    """Combine per-site summaries into network-wide totals"""
+    window_totals = dict.fromkeys(POWER_FIELDS + USAGE_FIELDS, 0.0)
+    power_kw = {}
+    online = [summary for summary in summaries if not summary.get('offline')]
+    overview = {'sites': len(online), 'regions': 0, 'total_usage': 0, 'total_capacity': 0,
+                'total_users': 0, 'active_users': 0, 'alerts': [],
+                'offline': [summary['name'] for summary in summaries if summary.get('offline')]}
+
+    for summary in online:
+        for key in ('regions', 'total_usage', 'total_capacity', 'total_users', 'active_users'):
+            overview[key] += summary[key]
+        for source, kw in summary['power_kw'].items():
+            power_kw[source] = power_kw.get(source, 0) + kw
+        for field in window_totals:
+            window_totals[field] += summary['window_totals'].get(field, 0.0)
+        overview['alerts'].extend(f"{summary['name']}: {alert}" for alert in summary['alerts'])
+
+    overview['power_kw'] = power_kw
+    overview['window'] = summarize(window_totals)
+    return overview
+
+
+def load_sites(path=SITES_CONFIG):
+    """Read and validate site definitions from a JSON config, or default to Malete.
+
+    Only Malete may rely on built-in data; every other site must bring its
+    own. Seed data is not required for sites served by a worker elsewhere.
+    """
+    if not path:
+        return [MALETE]
+    with open(path) as f:
+        config = json.load(f)
+
+    sites = []
+    for site in config.get('sites', []):
+        if site.get('id') == MALETE['id']:
+            site = {**MALETE, **site}
+        validate_site(site, local=not site.get('address'))
+        sites.append(site)
+    if not sites:
+        raise ValueError(f"no sites configured in {path}")
+    ids = [site['id'] for site in sites]
+    duplicates = sorted({site_id for site_id in ids if ids.count(site_id) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate site ids in {path}: {', '.join(duplicates)}")
+    return sites
+
+
+def parse_address(address):
+    host, port = address.rsplit(':', 1)
+    return host, int(port)
+
+
+class SiteRouter:
+    """Route dashboard queries to the partition owning each site"""
+
+    def __init__(self, sites, data_dir=DATA_DIR):
+        self.partitions = {}
+        for site in sites:
+            if site.get('address'):
+                self.partitions[site['id']] = RemotePartition(site, parse_address(site['address']))
+            else:
+                self.partitions[site['id']] = SitePartition(site, data_dir)
+
+    @classmethod
+    def from_config(cls, path=SITES_CONFIG, data_dir=DATA_DIR):
+        return cls(load_sites(path), data_dir)
+
+    def __getitem__(self, site_id):
+        return self.partitions[site_id]
+
+    def __len__(self):
+        return len(self.partitions)
+
+    def sites(self):
+        """Return {site_id: site name} in configuration order"""
+        return {site_id: partition.site['name'] for site_id, partition in self.partitions.items()}
+
+    def summaries(self):
+        """Per-site summaries; unreachable sites get an ``offline`` placeholder"""
+        summaries = []
+        for site_id, partition in self.partitions.items():
+            try:
+                summaries.append(partition.summary())
+            except SiteUnavailable as e:
+                summaries.append({'site_id': site_id, 'name': partition.site['name'],
+                                  'offline': True, 'error': str(e)})
+        return summaries
+
+    def network_overview(self):
+        return merge_summaries(self.summaries())
+
+
+def serve_partition(partition, address, authkey=AUTHKEY):
+    """Answer partition queries from dashboards until interrupted"""
+    if not authkey:
+        raise ValueError("Refusing to serve a site without WATER_SITES_AUTHKEY set")
+    listener = Listener(address, authkey=authkey)
+
+    def handle(conn):
+        with conn:
+            while True:
+                try:
+                    method, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if method not in PARTITION_METHODS:
+                    conn.send(('error', f"unknown method {method!r}"))
+                    continue
+                try:
+                    conn.send(('ok', getattr(partition, method)(*args)))
+                except Exception as e:
+                    conn.send(('error', str(e)))
+
+    with listener:
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                continue  # failed handshake, e.g. wrong authkey
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a site worker serving one site partition")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help="serve a site partition")
+    serve.add_argument('--site', required=True, help="site id from the sites config")
+    serve.add_argument('--config', default=SITES_CONFIG)
+    serve.add_argument('--host', default='127.0.0.1',
+                       help="interface to listen on; only expose it on a trusted network")
+    serve.add_argument('--port', type=int, required=True)
+    serve.add_argument('--data-dir', default=DATA_DIR, help="directory for the site's event log")
+
+    args = parser.parse_args(argv)
+    if not AUTHKEY:
+        parser.error("set WATER_SITES_AUTHKEY to a shared secret; workers unpickle what they receive")
+    sites = {site['id']: site for site in load_sites(args.config)}
+    if args.site not in sites:
+        parser.error(f"unknown site {args.site!r}; configured: {', '.join(sites)}")
+    try:
+        validate_site(sites[args.site])
+    except ValueError as e:
+        parser.error(str(e))
+
+    partition = SitePartition(sites[args.site], args.data_dir)
+    print(f"Serving site {args.site} on {args.host}:{args.port}")
+    try:
+        serve_partition(partition, (args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
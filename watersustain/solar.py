@@ -0,0 +1,115 @@
+"""Clear-sky solar PV output model.
+
+Sun position uses the NOAA low-precision equations, clear-sky beam and
+diffuse irradiance the Meinel air-mass model, and the array is modelled as a
+fixed tilted plane with a flat loss factor and a cloud derate. Every
+function works on whole NumPy arrays: site parameters may be arrays of shape
+``(n_sites,)`` and times an array of shape ``(n_times,)``, giving results of
+shape ``(n_sites, n_times)`` in one pass.
+"""
+import datetime
+import functools
+
+import numpy as np
+
+SOLAR_CONSTANT = 1353.0  # W/m², as used by the Meinel model
+UTC_OFFSET_HOURS = 1  # West Africa Time
+DEFAULT_TILT = 10.0  # degrees; close to the latitude across Kwara State
+DEFAULT_AZIMUTH = 180.0  # degrees clockwise from north (south-facing)
+DEFAULT_LOSSES = 0.14  # inverter, wiring, soiling and temperature losses
+DEFAULT_CLOUD_DERATE = 0.25
+ALBEDO = 0.2
+STEP_MINUTES = 15
+
+
+def _site_param(value):
+    # Site parameters broadcast along a leading site axis
+    return np.asarray(value, dtype=float)[..., None]
+
+
+def solar_position(times, lat, lon, utc_offset=UTC_OFFSET_HOURS):
+    """Return (zenith, azimuth) in degrees for local ``times`` at each site"""
+    times = np.asarray(times, dtype='datetime64[m]')
+    utc = times - np.timedelta64(int(utc_offset * 60), 'm')
+    day_start = utc.astype('datetime64[D]')
+    day_of_year = (day_start - utc.astype('datetime64[Y]')).astype(float) + 1
+    minutes = (utc - day_start).astype(float)
+
+    gamma = 2 * np.pi / 365 * (day_of_year - 1 + (minutes / 60 - 12) / 24)
+    eqtime = 229.18 * (0.000075 + 0.001868 * np.cos(gamma) - 0.032077 * np.sin(gamma)
+                       - 0.014615 * np.cos(2 * gamma) - 0.040849 * np.sin(2 * gamma))
+    declination = (0.006918 - 0.399912 * np.cos(gamma) + 0.070257 * np.sin(gamma)
+                   - 0.006758 * np.cos(2 * gamma) + 0.000907 * np.sin(2 * gamma)
+                   - 0.002697 * np.cos(3 * gamma) + 0.00148 * np.sin(3 * gamma))
+
+    lat = np.radians(_site_param(lat))
+    true_solar_minutes = minutes + eqtime + 4 * _site_param(lon)
+    hour_angle = np.radians(true_solar_minutes / 4 - 180)
+
+    cos_zenith = (np.sin(lat) * np.sin(declination)
+                  + np.cos(lat) * np.cos(declination) * np.cos(hour_angle))
+    zenith = np.degrees(np.arccos(np.clip(cos_zenith, -1, 1)))
+    azimuth = np.degrees(np.arctan2(np.sin(hour_angle),
+                                    np.cos(hour_angle) * np.sin(lat) - np.tan(declination) * np.cos(lat))) + 180
+    return zenith, azimuth % 360
+
+
+def clear_sky_irradiance(zenith):
+    """Return (dni, dhi, ghi) in W/m² for solar zenith angles in degrees"""
+    zenith = np.asarray(zenith, dtype=float)
+    up = zenith < 90
+    cos_zenith = np.where(up, np.cos(np.radians(zenith)), 1.0)
+    # Kasten-Young relative air mass
+    air_mass = 1 / (cos_zenith + 0.50572 * np.power(96.07995 - np.where(up, zenith, 0.0), -1.6364))
+    dni = np.where(up, SOLAR_CONSTANT * np.power(0.7, np.power(air_mass, 0.678)), 0.0)
+    dhi = 0.1 * dni
+    ghi = dni * np.where(up, cos_zenith, 0.0) + dhi
+    return dni, dhi, ghi
+
+
+def pv_output(times, lat, lon, capacity_kw, tilt=DEFAULT_TILT, azimuth=DEFAULT_AZIMUTH,
+              losses=DEFAULT_LOSSES, cloud_derate=DEFAULT_CLOUD_DERATE, utc_offset=UTC_OFFSET_HOURS):
+    """Expected array output in kW at each of the local ``times``"""
+    zenith, sun_azimuth = solar_position(times, lat, lon, utc_offset)
+    dni, dhi, ghi = clear_sky_irradiance(zenith)
+
+    tilt = np.radians(_site_param(tilt))
+    cos_incidence = (np.cos(np.radians(zenith)) * np.cos(tilt)
+                     + np.sin(np.radians(zenith)) * np.sin(tilt)
+                     * np.cos(np.radians(sun_azimuth - _site_param(azimuth))))
+    plane_of_array = (dni * np.clip(cos_incidence, 0, None)
+                      + dhi * (1 + np.cos(tilt)) / 2
+                      + ghi * ALBEDO * (1 - np.cos(tilt)) / 2)
+
+    capacity_kw = _site_param(capacity_kw)
+    output = (capacity_kw * plane_of_array / 1000 * (1 - _site_param(losses))
+              * (1 - _site_param(cloud_derate)))
+    return np.minimum(output, capacity_kw)
+
+
+@functools.lru_cache(maxsize=512)
+def _daily_profile(day, lat, lon, capacity_kw, tilt, azimuth, losses, cloud_derate, step_minutes):
+    start = np.datetime64(day, 'm')
+    times = start + np.arange(0, 24 * 60, step_minutes).astype('timedelta64[m]')
+    output = pv_output(times, lat, lon, capacity_kw, tilt, azimuth, losses, cloud_derate)
+    times.setflags(write=False)
+    output.setflags(write=False)
+    return times, output
+
+
+def daily_profile(day, lat, lon, capacity_kw, tilt=DEFAULT_TILT, azimuth=DEFAULT_AZIMUTH,
+                  losses=DEFAULT_LOSSES, cloud_derate=DEFAULT_CLOUD_DERATE, step_minutes=STEP_MINUTES):
+    """Return (times, kW) for one site and day; results are cached per day.
+
+    The returned arrays are read-only because they are shared between callers.
+    """
+    if isinstance(day, datetime.datetime):
+        day = day.date()
+    return _daily_profile(day, float(lat), float(lon), float(capacity_kw), float(tilt), float(azimuth),
+                          float(losses), float(cloud_derate), int(step_minutes))
+
+
+def hourly_profile(day, lat, lon, capacity_kw, **array):
+    """Mean expected kW for each hour of the day"""
+    times, output = daily_profile(day, lat, lon, capacity_kw, **array)
+    return output.reshape(24, -1).mean(axis=1)
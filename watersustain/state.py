@@ -0,0 +1,41 @@
+"""Default site data and session state setup"""
+
+
+DEFAULT_WATER_DATA = {
+    'total_usage': 15420,
+    'daily_limit': 20000,
+    'efficiency': 77.1,
+    'regions': [
+        {'name': 'Central Malete', 'usage': 4200, 'capacity': 5000, 'users': 1250, 'coordinator': 'Dr. Adebayo Johnson', 'contact': '+234-803-123-4567'},
+        {'name': 'North District', 'usage': 3800, 'capacity': 5000, 'users': 1100, 'coordinator': 'Engr. Fatima Usman', 'contact': '+234-805-234-5678'},
+        {'name': 'South District', 'usage': 3920, 'capacity': 5000, 'users': 1180, 'coordinator': 'Prof. Kayode Alabi', 'contact': '+234-807-345-6789'},
+        {'name': 'East Quarter', 'usage': 3500, 'capacity': 5000, 'users': 980, 'coordinator': 'Mrs. Halima Ibrahim', 'contact': '+234-809-456-7890'}
+    ]
+}
+
+DEFAULT_ELECTRICAL_DATA = {
+    'solar': {'current': 45, 'capacity': 60, 'status': 'optimal'},
+    'generator': {'current': 20, 'capacity': 40, 'status': 'standby'},
+    'grid': {'current': 35, 'capacity': 50, 'status': 'stable'}
+}
+
+DEFAULT_USER_METRICS = {
+    'total_users': 4510,
+    'active_users': 3890,
+    'avg_consumption': 3.42,
+    'peak_hours': '10:00 - 14:00'
+}
+
+
+def bind_site(state, partition):
+    """Point a Streamlit session state at the data of the selected site.
+
+    Views read ``water_data``, ``electrical_data`` and ``user_metrics`` from
+    the session and make changes through ``state.partition``.
+    """
+    data = partition.state()
+    state.partition = partition
+    state.site = data['site']
+    state.water_data = data['water_data']
+    state.electrical_data = data['electrical_data']
+    state.user_metrics = data['user_metrics']
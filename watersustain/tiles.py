@@ -0,0 +1,308 @@
+"""Offline base map tiles for the distribution map.
+
+Tiles live in an MBTiles file (a SQLite database) on local disk and are
+served by a small HTTP server, so the map loads from disk instead of the
+uplink. Fill the cache once while online, or import an existing file:
+
+    python -m watersustain.tiles prefetch
+    python -m watersustain.tiles import malete-area.mbtiles
+    python -m watersustain.tiles serve
+"""
+import argparse
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MBTILES_PATH = os.environ.get('WATER_TILES_PATH', os.path.join(BASE_DIR, 'tiles', 'malete.mbtiles'))
+TILE_HOST = os.environ.get('WATER_TILES_HOST', '127.0.0.1')
+TILE_PORT = int(os.environ.get('WATER_TILES_PORT', '8765'))
+# URL the browser uses to fetch tiles; override when the dashboard is viewed from another machine
+TILE_URL = os.environ.get('WATER_TILES_URL', f'http://{TILE_HOST}:{TILE_PORT}/tiles/{{z}}/{{x}}/{{y}}.png')
+TILE_ATTRIBUTION = '© OpenStreetMap contributors'
+
+UPSTREAM_URL = 'https://tile.openstreetmap.org/{z}/{x}/{y}.png'
+USER_AGENT = 'water-sustain-tile-cache/1.0'
+
+# west, south, east, north
+MALETE_BBOX = (5.30, 8.90, 5.40, 9.00)
+DEFAULT_MIN_ZOOM = 10
+DEFAULT_MAX_ZOOM = 16
+
+CACHE_MAX_AGE = 7 * 24 * 3600
+MISSING_MAX_AGE = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS tiles (
+    zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB,
+    PRIMARY KEY (zoom_level, tile_column, tile_row)
+);
+"""
+
+CONTENT_TYPES = {'png': 'image/png', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'webp': 'image/webp'}
+
+
+def has_tiles(path=MBTILES_PATH):
+    """Return True when a tile cache exists on disk and holds at least one tile"""
+    if not os.path.exists(path):
+        return False
+    try:
+        with sqlite3.connect(f'file:{path}?mode=ro', uri=True) as conn:
+            return conn.execute('SELECT 1 FROM tiles LIMIT 1').fetchone() is not None
+    except sqlite3.Error:
+        return False
+
+
+def covers(points, zoom, path=MBTILES_PATH):
+    """Return True when the cache holds the tile under every (lat, lon) point at ``zoom``"""
+    if not os.path.exists(path):
+        return False
+    zoom = int(zoom)
+    try:
+        with sqlite3.connect(f'file:{path}?mode=ro', uri=True) as conn:
+            for lat, lon in points:
+                x, y = lonlat_to_tile(lon, lat, zoom)
+                found = conn.execute(
+                    'SELECT 1 FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?',
+                    (zoom, x, _tms_row(zoom, y))
+                ).fetchone()
+                if found is None:
+                    return False
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def open_mbtiles(path=MBTILES_PATH):
+    """Open (and create if needed) a writable MBTiles file"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        'INSERT OR IGNORE INTO metadata (name, value) VALUES (?, ?)',
+        [('name', 'Malete base map'), ('format', 'png'), ('type', 'baselayer'),
+         ('attribution', TILE_ATTRIBUTION)]
+    )
+    conn.commit()
+    return conn
+
+
+def lonlat_to_tile(lon, lat, zoom):
+    """Convert a WGS84 coordinate to XYZ (slippy map) tile indices"""
+    n = 2 ** zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_in_bbox(bbox, min_zoom, max_zoom):
+    """Yield every (z, x, y) tile covering the bounding box"""
+    west, south, east, north = bbox
+    for z in range(min_zoom, max_zoom + 1):
+        x0, y0 = lonlat_to_tile(west, north, z)
+        x1, y1 = lonlat_to_tile(east, south, z)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield z, x, y
+
+
+def _tms_row(z, y):
+    # MBTiles stores rows in TMS order (origin bottom-left)
+    return (2 ** z - 1) - y
+
+
+def prefetch(bbox=MALETE_BBOX, min_zoom=DEFAULT_MIN_ZOOM, max_zoom=DEFAULT_MAX_ZOOM,
+             path=MBTILES_PATH, upstream=UPSTREAM_URL, delay=0.1):
+    """Download missing tiles for the bounding box into the MBTiles file"""
+    conn = open_mbtiles(path)
+    fetched = skipped = failed = 0
+    try:
+        for z, x, y in tiles_in_bbox(bbox, min_zoom, max_zoom):
+            row = _tms_row(z, y)
+            exists = conn.execute(
+                'SELECT 1 FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?', (z, x, row)
+            ).fetchone()
+            if exists:
+                skipped += 1
+                continue
+            request = urllib.request.Request(upstream.format(z=z, x=x, y=y), headers={'User-Agent': USER_AGENT})
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    data = response.read()
+            except OSError:
+                failed += 1
+                continue
+            conn.execute('INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)', (z, x, row, data))
+            conn.commit()
+            fetched += 1
+            time.sleep(delay)  # be polite to the upstream tile server
+        conn.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?)', ('bounds', ','.join(map(str, bbox))))
+        conn.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?)', ('minzoom', str(min_zoom)))
+        conn.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?)', ('maxzoom', str(max_zoom)))
+        conn.commit()
+    finally:
+        conn.close()
+    return {'fetched': fetched, 'skipped': skipped, 'failed': failed}
+
+
+def import_mbtiles(source, path=MBTILES_PATH):
+    """Merge the tiles of another MBTiles file into the local cache"""
+    conn = open_mbtiles(path)
+    try:
+        conn.execute('ATTACH DATABASE ? AS src', (source,))
+        count = conn.execute('SELECT COUNT(*) FROM src.tiles').fetchone()[0]
+        conn.execute(
+            'INSERT OR REPLACE INTO tiles SELECT zoom_level, tile_column, tile_row, tile_data FROM src.tiles'
+        )
+        conn.execute("INSERT OR REPLACE INTO metadata SELECT name, value FROM src.metadata WHERE name != 'name'")
+        conn.commit()
+        conn.execute('DETACH DATABASE src')
+    finally:
+        conn.close()
+    return count
+
+
+class TileStore:
+    """Read-only access to an MBTiles file, shared by the server threads"""
+
+    def __init__(self, path=MBTILES_PATH):
+        self.path = path
+        self._local = threading.local()
+        self.content_type = CONTENT_TYPES.get(self._metadata('format') or 'png', 'image/png')
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+            self._local.conn = conn
+        return conn
+
+    def _metadata(self, name):
+        row = self._conn().execute('SELECT value FROM metadata WHERE name=?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, z, x, y):
+        """Return the tile bytes for XYZ coordinates, or None"""
+        row = self._conn().execute(
+            'SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?',
+            (z, x, _tms_row(z, y))
+        ).fetchone()
+        return row[0] if row else None
+
+
+class TileRequestHandler(BaseHTTPRequestHandler):
+    """Serve /tiles/{z}/{x}/{y}.png from the tile store with HTTP caching headers"""
+
+    store = None
+
+    def do_GET(self):
+        parts = self.path.split('?', 1)[0].strip('/').split('/')
+        try:
+            if len(parts) != 4 or parts[0] != 'tiles':
+                raise ValueError
+            z, x, y = int(parts[1]), int(parts[2]), int(parts[3].split('.', 1)[0])
+        except ValueError:
+            self._send_empty(404, MISSING_MAX_AGE)
+            return
+
+        data = self.store.get(z, x, y)
+        if data is None:
+            self._send_empty(404, MISSING_MAX_AGE)
+            return
+
+        etag = '"%s"' % hashlib.sha1(data).hexdigest()[:16]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', self.store.content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self._send_cache_headers(etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_cache_headers(self, etag):
+        self.send_header('Cache-Control', f'public, max-age={CACHE_MAX_AGE}')
+        self.send_header('ETag', etag)
+        self.send_header('Access-Control-Allow-Origin', '*')
+
+    def _send_empty(self, status, max_age):
+        self.send_response(status)
+        self.send_header('Cache-Control', f'public, max-age={max_age}')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(path=MBTILES_PATH, host=TILE_HOST, port=TILE_PORT):
+    """Create a threaded tile server bound to host:port"""
+    handler = type('BoundTileRequestHandler', (TileRequestHandler,), {'store': TileStore(path)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_background_server(path=MBTILES_PATH, host=TILE_HOST, port=TILE_PORT):
+    """Start the tile server on a daemon thread.
+
+    Returns the server, or None when the port is already taken (for example
+    by a tile server started from another dashboard process).
+    """
+    try:
+        server = make_server(path, host, port)
+    except OSError:
+        return None
+    thread = threading.Thread(target=server.serve_forever, name='tile-server', daemon=True)
+    thread.start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the offline base map tile cache")
+    parser.add_argument('--path', default=MBTILES_PATH, help="MBTiles file to use")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fetch = commands.add_parser('prefetch', help="download tiles for an area")
+    fetch.add_argument('--bbox', type=float, nargs=4, default=MALETE_BBOX,
+                       metavar=('WEST', 'SOUTH', 'EAST', 'NORTH'))
+    fetch.add_argument('--min-zoom', type=int, default=DEFAULT_MIN_ZOOM)
+    fetch.add_argument('--max-zoom', type=int, default=DEFAULT_MAX_ZOOM)
+    fetch.add_argument('--upstream', default=UPSTREAM_URL)
+
+    load = commands.add_parser('import', help="merge an existing MBTiles file")
+    load.add_argument('source')
+
+    serve = commands.add_parser('serve', help="serve tiles over HTTP")
+    serve.add_argument('--host', default=TILE_HOST)
+    serve.add_argument('--port', type=int, default=TILE_PORT)
+
+    args = parser.parse_args(argv)
+    if args.command == 'prefetch':
+        result = prefetch(tuple(args.bbox), args.min_zoom, args.max_zoom, args.path, args.upstream)
+        print(f"Fetched {result['fetched']}, already cached {result['skipped']}, failed {result['failed']}")
+    elif args.command == 'import':
+        print(f"Imported {import_mbtiles(args.source, args.path)} tiles into {args.path}")
+    else:
+        server = make_server(args.path, args.host, args.port)
+        print(f"Serving {args.path} on http://{args.host}:{args.port}/tiles/{{z}}/{{x}}/{{y}}.png")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+"""Dashboard views, imported only when selected.
+
+Each view module exposes ``render()``. Importing a view pulls in its own
+plotting and analysis dependencies, so startup and reruns only pay for the
+view that is on screen.
+"""
+import importlib
+
+VIEWS = {
+    "📊 Dashboard": 'dashboard',
+    "👥 User Monitoring": 'users',
+    "🗺️ Regional Distribution": 'regional',
+    "⚡ Power Management": 'power',
+    "📤 Data Management": 'data_management',
+    "🌍 Network Overview": 'network',
+}
+
+# Only offered when the deployment serves more than one site
+NETWORK_VIEW = "🌍 Network Overview"
+
+
+def render(label):
+    """Import the view registered under ``label`` and draw it"""
+    module = importlib.import_module(f'{__name__}.{VIEWS[label]}')
+    module.render()
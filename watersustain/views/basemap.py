@@ -0,0 +1,32 @@
+"""Base map layer shared by the map views"""
+import streamlit as st
+
+
+@st.cache_resource
+def start_tile_server():
+    """Serve the offline base map tiles for the lifetime of the app process"""
+    from watersustain import tiles
+    if not tiles.has_tiles():
+        return None
+    tiles.start_background_server()
+    return tiles.TILE_URL
+
+
+def apply_base_map(fig, points, zoom):
+    """Draw the local tile cache under ``fig`` when it covers ``points`` at ``zoom``.
+
+    Falls back to online OpenStreetMap tiles for areas and zoom levels the
+    cache does not hold, so a map never renders on a blank background.
+    """
+    from watersustain import tiles
+
+    tile_url = start_tile_server() if tiles.covers(points, zoom) else None
+    if tile_url is None:
+        fig.update_layout(map_style='open-street-map')
+        return
+    fig.update_layout(map_style='white-bg', map_layers=[{
+        'below': 'traces',
+        'sourcetype': 'raster',
+        'sourceattribution': tiles.TILE_ATTRIBUTION,
+        'source': [tile_url]
+    }])
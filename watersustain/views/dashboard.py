@@ -0,0 +1,72 @@
+"""System overview dashboard view"""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from watersustain.metrics import total_power
+
+
+def render():
+    st.header("System Overview Dashboard")
+
+    # Key metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            "💧 Total Water Usage",
+            f"{st.session_state.water_data['total_usage']:,}L",
+            delta=f"{st.session_state.water_data['daily_limit'] - st.session_state.water_data['total_usage']:,}L remaining"
+        )
+
+    with col2:
+        st.metric(
+            "👥 Active Users",
+            f"{st.session_state.user_metrics['active_users']:,}",
+            delta=f"{st.session_state.user_metrics['total_users'] - st.session_state.user_metrics['active_users']} offline"
+        )
+
+    with col3:
+        st.metric("⚡ Total Power", f"{total_power(st.session_state.electrical_data)}kW", delta="Mixed sources")
+
+    with col4:
+        st.metric(
+            "📈 Efficiency",
+            f"{st.session_state.water_data['efficiency']}%",
+            delta="2.3% from last week"
+        )
+
+    st.divider()
+
+    # Charts
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Weekly Water Usage Trend")
+        weekly_data = pd.DataFrame({
+            'Day': ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
+            'Usage (L)': [14200, 15100, 14800, 15420, 16200, 13800, 12500],
+            'Users': [4200, 4350, 4180, 4510, 4680, 3920, 3650]
+        })
+
+        fig = px.line(weekly_data, x='Day', y='Usage (L)',
+                     title="Daily Water Consumption",
+                     color_discrete_sequence=['#3b82f6'])
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.subheader("Power Source Distribution")
+        power_data = pd.DataFrame({
+            'Source': ['Solar', 'Grid', 'Generator'],
+            'Current (kW)': [
+                st.session_state.electrical_data['solar']['current'],
+                st.session_state.electrical_data['grid']['current'],
+                st.session_state.electrical_data['generator']['current']
+            ],
+            'Colors': ['#f59e0b', '#10b981', '#ef4444']
+        })
+
+        fig = px.pie(power_data, values='Current (kW)', names='Source',
+                    title="Current Power Distribution",
+                    color_discrete_sequence=['#f59e0b', '#10b981', '#ef4444'])
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,188 @@
+"""Data management view: CSV analysis, billing and the change log"""
+import datetime
+import io
+import json
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from watersustain import billing
+from watersustain.metrics import per_capita_usage
+
+
+def render():
+    site = st.session_state.site
+    st.header("📤 Data Management & CSV Analysis")
+
+    # CSV upload section
+    st.subheader("📁 Upload Global Water Data")
+    uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
+
+    if uploaded_file is not None:
+        try:
+            df = pd.read_csv(uploaded_file)
+            st.success("✅ CSV file uploaded successfully!")
+
+            # Display basic info about the uploaded data
+            st.markdown(f"**File contains:** {len(df)} rows and {len(df.columns)} columns")
+
+            # Show first few rows
+            st.subheader("📋 Data Preview")
+            st.dataframe(df.head(), use_container_width=True)
+
+            # Basic analysis
+            if 'Country' in df.columns and 'Per Capita Water Use (Liters per Day)' in df.columns:
+                st.subheader("🔍 Quick Analysis")
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    # Countries with highest water usage
+                    latest_year_data = df[df['Year'] == df['Year'].max()]
+                    top_consumers = latest_year_data.nlargest(10, 'Per Capita Water Use (Liters per Day)')
+
+                    fig = px.bar(top_consumers,
+                               x='Country',
+                               y='Per Capita Water Use (Liters per Day)',
+                               title="Top 10 Water Consumers (Per Capita)",
+                               color='Water Scarcity Level',
+                               color_discrete_map={'Low': '#10b981', 'Moderate': '#f59e0b', 'High': '#ef4444'})
+                    st.plotly_chart(fig, use_container_width=True)
+
+                with col2:
+                    # Water scarcity distribution
+                    scarcity_counts = latest_year_data['Water Scarcity Level'].value_counts()
+                    fig = px.pie(values=scarcity_counts.values,
+                               names=scarcity_counts.index,
+                               title="Global Water Scarcity Distribution",
+                               color_discrete_map={'Low': '#10b981', 'Moderate': '#f59e0b', 'High': '#ef4444'})
+                    st.plotly_chart(fig, use_container_width=True)
+
+                # Comparative analysis with Nigeria
+                nigeria_data = df[df['Country'] == 'Nigeria']
+                if not nigeria_data.empty:
+                    latest_nigeria = nigeria_data[nigeria_data['Year'] == nigeria_data['Year'].max()].iloc[0]
+
+                    st.subheader(f"🇳🇬 Nigeria vs {site['name']} Comparison")
+
+                    comp_col1, comp_col2, comp_col3 = st.columns(3)
+
+                    with comp_col1:
+                        st.metric(
+                            "Nigeria (National)",
+                            f"{latest_nigeria['Per Capita Water Use (Liters per Day)']:.1f}L/day",
+                            delta="Reference"
+                        )
+
+                    with comp_col2:
+                        site_per_capita = per_capita_usage(st.session_state.water_data['total_usage'],
+                                                           st.session_state.user_metrics['active_users'])
+                        st.metric(
+                            f"{site['name']} (Current)",
+                            f"{site_per_capita:.1f}L/day",
+                            delta=f"{site_per_capita - latest_nigeria['Per Capita Water Use (Liters per Day)']:+.1f}L vs national"
+                        )
+
+                    with comp_col3:
+                        efficiency_score = min(100, (latest_nigeria['Per Capita Water Use (Liters per Day)'] / site_per_capita) * 100)
+                        st.metric(
+                            "Efficiency Score",
+                            f"{efficiency_score:.1f}%",
+                            delta="vs national average"
+                        )
+
+        except Exception as e:
+            st.error(f"❌ Error processing CSV file: {str(e)}")
+
+    st.divider()
+
+    # Bill run over the last billing period
+    st.subheader("🧾 Water Billing")
+
+    billed = st.session_state.partition.billing_summary()
+    st.caption(f"Billing period {billed['period']}")
+    st.dataframe(pd.DataFrame(billed['regions']).rename(columns={
+        'region': 'Region',
+        'accounts': 'Accounts',
+        'consumption_m3': 'Consumption (m³)',
+        'volumetric_charge': 'Volumetric (₦)',
+        'surcharge': 'Surcharge (₦)',
+        'service_charge': 'Service Charge (₦)',
+        'total_due': 'Total Due (₦)',
+        'lifeline_savings': 'Lifeline Savings (₦)',
+    }).round(2), use_container_width=True)
+
+    accounts_file = st.file_uploader("Accounts CSV (account_id, region, consumption_m3); "
+                                     "leave empty to bill the site's registered users",
+                                     type="csv", key="billing_accounts")
+    upload_period = st.text_input("Period the accounts file covers", placeholder="e.g. 2026-09",
+                                  disabled=accounts_file is None)
+    invoice_format = st.radio("Invoice format", ["CSV", "XLSX"], horizontal=True)
+    # An uploaded file's invoices need the period it covers; the site's own usage has a known one
+    if st.button("Run Bill Run", disabled=accounts_file is not None and not upload_period.strip()):
+        if accounts_file is not None:
+            period = upload_period.strip()
+            accounts = pd.read_csv(accounts_file, chunksize=billing.CHUNK_SIZE,
+                                   dtype={'account_id': str, 'region': 'category'})
+        else:
+            period = billed['period']
+            accounts = st.session_state.partition.billing_accounts()
+        invoices = billing.bill_chunks(accounts, period, billing.site_tariff(site))
+        totals = billing.RunTotals()
+        try:
+            if invoice_format == "XLSX":
+                buffer = io.BytesIO()
+                billing.write_xlsx(invoices, buffer, totals)
+                data, mime = buffer.getvalue(), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            else:
+                buffer = io.StringIO()
+                billing.write_csv(invoices, buffer, totals)
+                data, mime = buffer.getvalue(), "text/csv"
+        except (KeyError, ValueError) as e:
+            st.error(f"Could not bill the accounts file: {e}")
+        else:
+            overall = totals.overall()
+            st.success(f"Billed {overall['accounts']:,.0f} accounts: ₦{overall['total_due']:,.0f} due, "
+                       f"₦{overall['lifeline_savings']:,.0f} lifeline savings")
+            st.download_button(
+                label=f"🧾 Download Invoices ({invoice_format})",
+                data=data,
+                file_name=f"{site['id']}_invoices_{datetime.date.today().strftime('%Y%m%d')}.{invoice_format.lower()}",
+                mime=mime
+            )
+
+    st.divider()
+
+    # Audit trail from the site's event log
+    st.subheader("📜 Change Log")
+
+    events = st.session_state.partition.recent_events(50)
+    if events:
+        st.dataframe(pd.DataFrame([{
+            'Seq': event['seq'],
+            'Time': event['time'],
+            'Change': event['type'],
+            'Details': json.dumps(event['data']),
+        } for event in events]), use_container_width=True)
+    else:
+        st.info("No changes recorded yet.")
+
+    with st.expander("🕒 Region state at a point in time"):
+        # Rebuilding reads the log and a snapshot, so only do it on request
+        with st.form("region_at"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                past_region = st.selectbox("Region", [region['name'] for region in st.session_state.water_data['regions']])
+            with col2:
+                past_date = st.date_input("Date", value=datetime.date.today())
+            with col3:
+                past_time = st.time_input("Time", value=datetime.time(23, 59))
+            lookup = st.form_submit_button("Show Region State")
+
+        if lookup:
+            record = st.session_state.partition.region_at(past_region, datetime.datetime.combine(past_date, past_time))
+            if record is None:
+                st.warning("No recorded state for that time.")
+            else:
+                st.json(record)
@@ -0,0 +1,77 @@
+"""Network-wide overview across all configured sites"""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from watersustain.sites import merge_summaries
+from watersustain.views.basemap import apply_base_map
+
+
+@st.cache_data(ttl=30)
+def load_site_summaries(_router):
+    """Collect per-site summaries, refreshed at most every 30 seconds"""
+    return _router.summaries()
+
+
+def render():
+    st.header("Network Overview")
+
+    summaries = load_site_summaries(st.session_state.router)
+    overview = merge_summaries(summaries)
+    window = overview['window']
+
+    for name in overview['offline']:
+        st.warning(f"🔴 {name} is offline and left out of the network totals.")
+    summaries = [s for s in summaries if not s.get('offline')]
+    if not summaries:
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("🏘️ Sites", f"{overview['sites']}", delta=f"{overview['regions']} regions", delta_color="off")
+    with col2:
+        st.metric("💧 Total Water Usage", f"{overview['total_usage']:,}L",
+                  delta=f"{overview['total_capacity'] - overview['total_usage']:,}L remaining")
+    with col3:
+        st.metric("👥 Active Users", f"{overview['active_users']:,}",
+                  delta=f"{overview['total_users'] - overview['active_users']:,} offline")
+    with col4:
+        st.metric("☀️ Renewable (30 days)", f"{window['renewable_pct']:.1f}%",
+                  delta=f"{window['co2_tons']:.1f} tons CO₂", delta_color="off")
+
+    st.divider()
+
+    sites_df = pd.DataFrame([{
+        'Site': s['name'],
+        'Latitude': s['lat'],
+        'Longitude': s['lon'],
+        'Usage': s['total_usage'],
+        'Users': s['total_users'],
+        'Utilization': (s['total_usage'] / s['total_capacity']) * 100,
+        'Alerts': len(s['alerts']),
+    } for s in summaries])
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        fig = px.bar(sites_df, x='Site', y='Utilization',
+                    title="Capacity Utilization by Site",
+                    color='Utilization',
+                    color_continuous_scale='RdYlGn_r')
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        fig = px.scatter_map(sites_df, lat='Latitude', lon='Longitude', size='Usage', color='Utilization',
+                             hover_name='Site', hover_data={'Users': True, 'Alerts': True},
+                             color_continuous_scale='RdYlGn_r', title="Sites Across the Network",
+                             zoom=7, height=450)
+        apply_base_map(fig, list(zip(sites_df['Latitude'], sites_df['Longitude'])), zoom=7)
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(sites_df.drop(columns=['Latitude', 'Longitude']), use_container_width=True)
+
+    if overview['alerts']:
+        st.subheader("🚨 Active Alerts")
+        for alert in overview['alerts']:
+            st.error(f"⚠️ {alert}")
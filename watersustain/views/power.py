@@ -0,0 +1,141 @@
+"""Power management and sustainability view"""
+import datetime
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from watersustain.forecast import hourly_power_forecast
+from watersustain.metrics import UTILIZATION_TARGET, utilization
+from watersustain.solar import DEFAULT_CLOUD_DERATE
+
+
+def load_slider(label, source):
+    """Slider for a power source's load, bounded by the site's capacity for it"""
+    capacity = source['capacity']
+    kind = type(capacity)
+    return st.slider(label, kind(0), capacity, min(kind(source['current']), capacity))
+
+
+def render():
+    st.header("Power Management & Sustainability")
+
+    # Power source status
+    st.subheader("🔋 Current Power Status")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        solar = st.session_state.electrical_data['solar']
+        solar_util = utilization(solar['current'], solar['capacity'])
+        st.markdown("### ☀️ Solar Power")
+        st.metric("Current Output", f"{solar['current']}kW")
+        st.metric("Capacity", f"{solar['capacity']}kW")
+        st.progress(min(solar_util / 100, 1.0), text=f"Utilization: {solar_util:.1f}%")
+        st.markdown(f"**Status:** {solar['status']}")
+
+    with col2:
+        grid = st.session_state.electrical_data['grid']
+        grid_util = utilization(grid['current'], grid['capacity'])
+        st.markdown("### 🏢 Grid Supply")
+        st.metric("Current Load", f"{grid['current']}kW")
+        st.metric("Capacity", f"{grid['capacity']}kW")
+        st.progress(min(grid_util / 100, 1.0), text=f"Utilization: {grid_util:.1f}%")
+        st.markdown(f"**Status:** {grid['status']}")
+
+    with col3:
+        generator = st.session_state.electrical_data['generator']
+        gen_util = utilization(generator['current'], generator['capacity'])
+        st.markdown("### 🔧 Generator Backup")
+        st.metric("Current Load", f"{generator['current']}kW")
+        st.metric("Capacity", f"{generator['capacity']}kW")
+        st.progress(min(gen_util / 100, 1.0), text=f"Utilization: {gen_util:.1f}%")
+        st.markdown(f"**Status:** {generator['status']}")
+
+    st.divider()
+
+    # Power management controls
+    st.subheader("⚙️ Power Management Controls")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**Optimization Schedule:**")
+        schedule_data = pd.DataFrame({
+            'Time Period': ['06:00 - 18:00', '18:00 - 22:00', '22:00 - 06:00', 'Emergency'],
+            'Primary Source': ['Solar', 'Grid', 'Grid + Storage', 'Generator'],
+            'Priority': ['High', 'Medium', 'Medium', 'Critical']
+        })
+        st.dataframe(schedule_data, use_container_width=True)
+
+        # Power adjustment controls
+        with st.expander("🔧 Adjust Power Sources"):
+            new_solar = load_slider("Solar Output (kW)", solar)
+            new_grid = load_slider("Grid Load (kW)", grid)
+            new_gen = load_slider("Generator Load (kW)", generator)
+
+            if st.button("Apply Power Changes"):
+                st.session_state.partition.set_power(new_solar, new_grid, new_gen, datetime.datetime.now())
+                st.success("Power configuration updated!")
+                st.rerun()
+
+    with col2:
+        st.markdown("**Sustainability Metrics (last 30 days):**")
+
+        window = st.session_state.partition.sustainability()
+        billing = st.session_state.partition.billing_summary()['overall']
+        # Revenue targets are a site decision; rows without one show no target
+        billing_targets = st.session_state.site.get('billing_targets', {})
+        sustainability_metrics = pd.DataFrame({
+            'Metric': [
+                'Renewable Energy %',
+                'Carbon Footprint',
+                'Capacity Utilization',
+                'Monthly Cost Savings',
+                'Monthly Water Revenue',
+                'Lifeline Savings to Households'
+            ],
+            'Value': [
+                f"{window['renewable_pct']:.1f}%",
+                f"{window['co2_tons']:.1f} tons CO₂/month",
+                f"{window['utilization_pct']:.1f}%",
+                f"₦{window['cost_savings']:,.0f}",
+                f"₦{billing['total_due']:,.0f}",
+                f"₦{billing['lifeline_savings']:,.0f}"
+            ],
+            'Target': [
+                "60%",
+                "< 2.0 tons",
+                f"< {UTILIZATION_TARGET:.0f}%",
+                "> ₦200,000",
+                f"> ₦{billing_targets['revenue']:,.0f}" if 'revenue' in billing_targets else "—",
+                f"> ₦{billing_targets['lifeline_savings']:,.0f}" if 'lifeline_savings' in billing_targets else "—"
+            ]
+        })
+        st.dataframe(sustainability_metrics, use_container_width=True)
+
+        # Environmental impact chart
+        impact_data = pd.DataFrame(st.session_state.partition.monthly_series(6)).rename(columns={
+            'month': 'Month',
+            'co2_tons': 'CO2 Emissions (tons)',
+            'renewable_pct': 'Renewable %'
+        })
+
+        fig = px.line(impact_data, x='Month', y='CO2 Emissions (tons)',
+                     title="Environmental Impact Trend",
+                     color_discrete_sequence=['#ef4444'])
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.divider()
+
+    # Power forecasting
+    st.subheader("🔮 Power Demand Forecasting")
+
+    cloud_derate = st.slider("Expected Cloud Cover Derate (%)", 0, 80, int(DEFAULT_CLOUD_DERATE * 100)) / 100
+    forecast_df = pd.DataFrame(hourly_power_forecast(st.session_state.site, solar['capacity'],
+                                                     cloud_derate=cloud_derate))
+
+    fig = px.line(forecast_df, x='Hour', y=['Solar Available', 'Predicted Demand', 'Grid Required'],
+                 title="24-Hour Power Demand Forecast",
+                 labels={'value': 'Power (kW)', 'variable': 'Source'})
+    st.plotly_chart(fig, use_container_width=True)
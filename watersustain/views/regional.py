@@ -0,0 +1,164 @@
+"""Regional water distribution view"""
+import datetime
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from watersustain.metrics import get_status_text, utilization
+from watersustain.nexus import region_summary
+from watersustain.sites import region_coordinates
+from watersustain.views.basemap import apply_base_map
+
+
+def render():
+    site = st.session_state.site
+    st.header("Regional Water Distribution Analysis")
+
+    # Regional overview cards
+    st.subheader("Regional Status Overview")
+
+    cols = st.columns(2)
+    for i, region in enumerate(st.session_state.water_data['regions']):
+        with cols[i % 2]:
+            region_utilization = utilization(region['usage'], region['capacity'])
+            status_text = get_status_text(region['usage'], region['capacity'])
+
+            with st.container():
+                st.markdown(f"### 📍 {region['name']}")
+
+                col_a, col_b = st.columns(2)
+                with col_a:
+                    st.metric("Current Usage", f"{region['usage']:,}L")
+                    st.metric("Users", f"{region['users']:,}")
+                with col_b:
+                    st.metric("Capacity", f"{region['capacity']:,}L")
+                    st.metric("Utilization", f"{region_utilization:.1f}%")
+
+                # Status indicator
+                if status_text == "Normal":
+                    st.success(f"Status: {status_text}")
+                elif status_text == "High Usage":
+                    st.warning(f"Status: {status_text}")
+                else:
+                    st.error(f"Status: {status_text}")
+
+                st.progress(min(region_utilization / 100, 1.0))
+
+                # Contact info
+                st.markdown(f"**Coordinator:** {region['coordinator']}")
+                st.markdown(f"**Contact:** {region['contact']}")
+
+    st.divider()
+
+    # Regional comparison chart
+    st.subheader("📊 Regional Usage Comparison")
+
+    regions_df = pd.DataFrame(st.session_state.water_data['regions'])
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        name='Current Usage',
+        x=regions_df['name'],
+        y=regions_df['usage'],
+        marker_color='lightblue'
+    ))
+
+    fig.add_trace(go.Bar(
+        name='Capacity',
+        x=regions_df['name'],
+        y=regions_df['capacity'],
+        marker_color='darkblue',
+        opacity=0.6
+    ))
+
+    fig.update_layout(
+        title="Water Usage vs Capacity by Region",
+        xaxis_title="Region",
+        yaxis_title="Water (Liters)",
+        barmode='group'
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Distribution efficiency analysis
+    st.subheader("🎯 Distribution Efficiency Analysis")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Usage per capita by region
+        regions_df['per_capita'] = regions_df['usage'] / regions_df['users']
+        fig = px.bar(regions_df, x='name', y='per_capita',
+                    title="Water Usage Per Capita by Region",
+                    color='per_capita',
+                    color_continuous_scale='Blues')
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        # Capacity utilization
+        regions_df['utilization'] = (regions_df['usage'] / regions_df['capacity']) * 100
+        fig = px.pie(regions_df, values='utilization', names='name',
+                    title="Capacity Utilization Distribution")
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.divider()
+
+    # Regional distribution map
+    st.subheader("🗺️ Regional Distribution Map")
+
+    # Region coordinates come from the site configuration
+    regions = st.session_state.water_data['regions']
+    coordinates = [region_coordinates(site, region['name']) for region in regions]
+    map_data = pd.DataFrame({
+        'Region': [region['name'] for region in regions],
+        'Latitude': [lat for lat, lon in coordinates],
+        'Longitude': [lon for lat, lon in coordinates],
+        'Usage': [region['usage'] for region in st.session_state.water_data['regions']],
+        'Users': [region['users'] for region in st.session_state.water_data['regions']],
+        'Utilization': [utilization(region['usage'], region['capacity']) for region in st.session_state.water_data['regions']]
+    })
+
+    fig = px.scatter_map(
+        map_data,
+        lat='Latitude',
+        lon='Longitude',
+        size='Usage',
+        color='Utilization',
+        hover_name='Region',
+        hover_data={'Users': True, 'Usage': True},
+        color_continuous_scale='RdYlGn_r',
+        title=f"Water Distribution Across {site['name']} Regions",
+        zoom=12,
+        height=500
+    )
+    # Prefer the local tile cache where it covers this site
+    apply_base_map(fig, coordinates, zoom=12)
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.divider()
+
+    # Water-energy nexus
+    st.subheader("💧⚡ Water-Energy Nexus")
+
+    nexus_table = st.session_state.partition.nexus_table()
+    if nexus_table.empty:
+        st.info("No power and usage readings to relate yet.")
+        return
+    since = nexus_table['timestamp'].max() - datetime.timedelta(days=7)
+    summary = region_summary(nexus_table, since=since)
+
+    cols = st.columns(len(summary))
+    for col, row in zip(cols, summary.itertuples()):
+        with col:
+            st.metric(row.region, f"{row.kwh_per_m3:.1f} kWh/m³", delta=f"₦{row.cost_per_m3:,.0f}/m³",
+                      delta_color="off")
+
+    recent = nexus_table[nexus_table['timestamp'] >= since]
+    fig = px.line(recent, x='timestamp', y='kwh_per_m3', color='region',
+                 title="Energy per Cubic Metre Pumped (last 7 days, hourly)",
+                 labels={'timestamp': 'Time', 'kwh_per_m3': 'kWh/m³', 'region': 'Region'})
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,188 @@
+"""User monitoring and record management view"""
+from io import StringIO
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from watersustain.metrics import per_capita_usage, utilization
+
+
+# Load and process global water data
+@st.cache_data
+def load_global_water_data():
+    """Load the global water consumption data for reference"""
+    try:
+        # Sample data from the CSV - in practice, you would load the actual file
+        global_data = """Country,Year,Total Water Consumption (Billion Cubic Meters),Per Capita Water Use (Liters per Day),Agricultural Water Use (%),Industrial Water Use (%),Household Water Use (%),Rainfall Impact (Annual Precipitation in mm),Groundwater Depletion Rate (%),Water Scarcity Level
+Nigeria,2024,487.5,245.8,52.3,28.7,19.0,1200.5,3.2,Moderate
+Brazil,2024,417.2,310.0,55.5,18.4,23.9,1354.1,2.9,Low
+India,2024,479.8,337.8,42.8,26.5,22.6,1391.9,2.2,Low
+China,2024,507.3,253.1,50.9,25.6,26.8,1796.5,2.5,Moderate
+USA,2024,249.5,186.4,51.4,24.8,27.7,1771.2,1.6,High"""
+
+        df = pd.read_csv(StringIO(global_data))
+        return df
+    except:
+        return pd.DataFrame()
+
+
+def render():
+    st.header("User Monitoring & Management")
+
+    # User metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Total Registered Users", f"{st.session_state.user_metrics['total_users']:,}")
+    with col2:
+        st.metric("Currently Active", f"{st.session_state.user_metrics['active_users']:,}")
+    with col3:
+        st.metric("Avg. Consumption", f"{st.session_state.user_metrics['avg_consumption']}L/user")
+    with col4:
+        st.metric("Peak Hours", st.session_state.user_metrics['peak_hours'])
+
+    st.divider()
+
+    # Global comparison
+    st.subheader("🌍 Global Water Usage Comparison")
+    global_df = load_global_water_data()
+
+    if not global_df.empty:
+        # Calculate Nigeria's position
+        nigeria_per_capita = 245.8  # From the data
+        site_name = st.session_state.site['name']
+        site_per_capita = per_capita_usage(st.session_state.water_data['total_usage'],
+                                           st.session_state.user_metrics['active_users'])
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.metric(
+                "Nigeria (National Average)",
+                f"{nigeria_per_capita:.1f}L/day per capita",
+                delta="Reference baseline"
+            )
+
+        with col2:
+            st.metric(
+                f"{site_name} (Current)",
+                f"{site_per_capita:.1f}L/day per capita",
+                delta=f"{site_per_capita - nigeria_per_capita:+.1f}L vs national avg"
+            )
+
+        # Global comparison chart
+        if len(global_df) > 0:
+            fig = px.bar(global_df, x='Country', y='Per Capita Water Use (Liters per Day)',
+                        title="Global Per Capita Water Usage Comparison (2024)",
+                        color='Water Scarcity Level',
+                        color_discrete_map={'Low': '#10b981', 'Moderate': '#f59e0b', 'High': '#ef4444'})
+
+            # Add the site's data point
+            fig.add_scatter(x=[f'{site_name}, Nigeria'], y=[site_per_capita],
+                           mode='markers', marker=dict(size=15, color='purple'),
+                           name=f'{site_name} Current')
+
+            st.plotly_chart(fig, use_container_width=True)
+
+    st.divider()
+
+    # User management section
+    st.subheader("📝 User Record Management")
+
+    # Select region to manage
+    selected_region = st.selectbox(
+        "Select Region to Manage:",
+        [region['name'] for region in st.session_state.water_data['regions']]
+    )
+
+    # Find selected region data
+    region_data = next(r for r in st.session_state.water_data['regions'] if r['name'] == selected_region)
+    region_index = st.session_state.water_data['regions'].index(region_data)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown(f"**Current Data for {selected_region}:**")
+        st.markdown(f"- **Users:** {region_data['users']:,}")
+        st.markdown(f"- **Water Usage:** {region_data['usage']:,}L")
+        st.markdown(f"- **Capacity:** {region_data['capacity']:,}L")
+        st.markdown(f"- **Coordinator:** {region_data['coordinator']}")
+        st.markdown(f"- **Contact:** {region_data['contact']}")
+
+        region_utilization = utilization(region_data['usage'], region_data['capacity'])
+        st.progress(min(region_utilization / 100, 1.0), text=f"Capacity Utilization: {region_utilization:.1f}%")
+
+    with col2:
+        st.markdown("**Update Record:**")
+
+        with st.form(f"update_form_{selected_region}"):
+            new_users = st.number_input("Number of Users",
+                                       min_value=0,
+                                       value=region_data['users'],
+                                       step=1)
+
+            new_usage = st.number_input("Current Water Usage (L)",
+                                       min_value=0,
+                                       value=region_data['usage'],
+                                       step=10)
+
+            new_capacity = st.number_input("Water Capacity (L)",
+                                          min_value=1,
+                                          value=region_data['capacity'],
+                                          step=100)
+
+            new_coordinator = st.text_input("Coordinator Name",
+                                           value=region_data['coordinator'])
+
+            new_contact = st.text_input("Contact Information",
+                                       value=region_data['contact'])
+
+            submitted = st.form_submit_button("🔄 Update Record")
+
+            if submitted:
+                # Update the region data and total metrics
+                st.session_state.partition.update_region(region_index, {
+                    'name': selected_region,
+                    'usage': new_usage,
+                    'capacity': new_capacity,
+                    'users': new_users,
+                    'coordinator': new_coordinator,
+                    'contact': new_contact
+                })
+
+                st.success(f"✅ Record updated successfully for {selected_region}!")
+                st.rerun()
+
+    st.divider()
+
+    # User activity chart
+    st.subheader("📈 User Activity Analysis")
+    weekly_users = pd.DataFrame({
+        'Day': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
+        'Active Users': [4200, 4350, 4180, 4510, 4680, 3920, 3650],
+        'New Registrations': [45, 67, 23, 89, 156, 78, 34],
+        'Water Requests': [8400, 8700, 8360, 9020, 9360, 7840, 7300]
+    })
+
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    fig.add_trace(
+        go.Bar(x=weekly_users['Day'], y=weekly_users['Active Users'], name="Active Users"),
+        secondary_y=False,
+    )
+
+    fig.add_trace(
+        go.Scatter(x=weekly_users['Day'], y=weekly_users['Water Requests'],
+                  mode='lines+markers', name="Water Requests"),
+        secondary_y=True,
+    )
+
+    fig.update_xaxes(title_text="Day of Week")
+    fig.update_yaxes(title_text="Number of Users", secondary_y=False)
+    fig.update_yaxes(title_text="Water Requests", secondary_y=True)
+    fig.update_layout(title_text="Weekly User Activity & Water Requests")
+
+    st.plotly_chart(fig, use_container_width=True)